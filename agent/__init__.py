@@ -1,5 +1,7 @@
 __all__ = [
     "tools",
     "llm",
+    "llm_cache",
+    "checkpoint",
     "graph",
 ]
\ No newline at end of file
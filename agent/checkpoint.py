@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sqlite3
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+	"""SqliteSaver whose async API runs the sync one on a worker thread.
+
+	The stock async saver binds to the event loop it was created in, which does not fit a
+	connection opened once at import and shared by every `asyncio.run` in the CLI.
+	"""
+
+	async def aget_tuple(self, config):
+		return await asyncio.to_thread(self.get_tuple, config)
+
+	async def alist(
+		self,
+		config,
+		*,
+		filter: Optional[Dict[str, Any]] = None,
+		before=None,
+		limit: Optional[int] = None,
+	) -> AsyncIterator:
+		items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+		for item in items:
+			yield item
+
+	async def aput(self, config, checkpoint, metadata, new_versions):
+		return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+	async def aput_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+		await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+	async def adelete_thread(self, thread_id: str) -> None:
+		await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def open_checkpointer() -> ThreadedSqliteSaver:
+	"""Open the persistent checkpoint store.
+
+	Environment variables:
+	- AGENT_CHECKPOINT_DB (default: ./.agent_state.sqlite)
+	"""
+	path = os.getenv("AGENT_CHECKPOINT_DB", "./.agent_state.sqlite")
+	conn = sqlite3.connect(path, check_same_thread=False)
+	return ThreadedSqliteSaver(conn)
@@ -1,23 +1,43 @@
-import sys
-from typing import Optional
+import asyncio
 
 import typer
 from dotenv import load_dotenv
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 
 from .graph import create_agent_graph
+from .llm import aclose_clients, keep_alive
 
 
 load_dotenv()
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 console = Console()
 
-def _print_markdown(text: str) -> None:
-	if not text:
-		return
-	console.print(Markdown(text))
+# Re-render the live Markdown region every N tokens rather than on each one.
+_RENDER_EVERY = 8
+
+
+async def _stream_reply(graph, message: str, config: dict) -> str:
+	"""Stream the model's reply token by token and return the assembled text."""
+	buf = ""
+	pending = 0
+	with Live(Markdown(""), console=console, refresh_per_second=12) as live:
+		async for chunk, meta in graph.astream(
+			{"messages": [HumanMessage(content=message)]}, config, stream_mode="messages"
+		):
+			if meta.get("langgraph_node") != "model" or not isinstance(chunk, AIMessage):
+				continue
+			if not isinstance(chunk.content, str) or not chunk.content:
+				continue
+			buf += chunk.content
+			pending += 1
+			if pending >= _RENDER_EVERY:
+				live.update(Markdown(buf))
+				pending = 0
+		live.update(Markdown(buf))
+	return buf
 
 
 @app.command(help="Send one message to the agent and print the reply.")
@@ -27,31 +47,32 @@ def chat(
 ):
 	graph = create_agent_graph()
 	config = {"configurable": {"thread_id": thread}}
-	last_text: Optional[str] = None
-	for state in graph.stream({"messages": [HumanMessage(content=message)]}, config, stream_mode="values"):
-		msg = state["messages"][-1]
-		last_text = getattr(msg, "content", None)
-	_print_markdown(last_text or "")
+	asyncio.run(_stream_reply(graph, message, config))
+
+
+async def _repl_async(thread: str) -> None:
+	graph = create_agent_graph()
+	config = {"configurable": {"thread_id": thread}}
+	pinger = asyncio.create_task(keep_alive())
+	try:
+		while True:
+			try:
+				user = await asyncio.to_thread(console.input, "[bold green]You[/]: ")
+			except (EOFError, KeyboardInterrupt):
+				break
+			if user.strip().lower() in {"exit", "quit"}:
+				break
+			await _stream_reply(graph, user, config)
+	finally:
+		pinger.cancel()
+		await aclose_clients()
 
 
 @app.command(help="Start an interactive REPL with the agent.")
 def repl(thread: str = typer.Option("repl", "--thread", help="Thread id for the REPL session")):
 	console.print("Type 'exit' or 'quit' to leave.")
-	graph = create_agent_graph()
-	config = {"configurable": {"thread_id": thread}}
-	while True:
-		try:
-			user = console.input("[bold green]You[/]: ")
-		except (EOFError, KeyboardInterrupt):
-			break
-		if user.strip().lower() in {"exit", "quit"}:
-			break
-		last_text: Optional[str] = None
-		for state in graph.stream({"messages": [HumanMessage(content=user)]}, config, stream_mode="values"):
-			msg = state["messages"][-1]
-			last_text = getattr(msg, "content", None)
-		_print_markdown(last_text or "")
+	asyncio.run(_repl_async(thread))
 
 
 if __name__ == "__main__":
-	app()
\ No newline at end of file
+	app()
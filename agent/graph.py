@@ -1,12 +1,14 @@
+from functools import lru_cache
 from typing import Annotated, TypedDict, List
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph import StateGraph, START
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.memory import MemorySaver
 
+from .checkpoint import open_checkpointer
 from .llm import get_chat_model
+from .llm_cache import LLMCache
 from .tools import get_tools
 
 
@@ -14,13 +16,34 @@ class AgentState(TypedDict):
 	messages: Annotated[List[BaseMessage], add_messages]
 
 
+# Opened once and shared across compiled graphs; thread memory persists across processes.
+_CHECKPOINTER = open_checkpointer()
+_LLM_CACHE = LLMCache()
+
+
+@lru_cache(maxsize=None)
 def create_agent_graph():
-	"""Create and compile the agent graph with a memory checkpointer."""
+	"""Create and compile the agent graph with a persistent SQLite checkpointer.
+
+	The compiled graph is cached; it does not vary between messages.
+	"""
 	tools = get_tools()
-	model = get_chat_model().bind_tools(tools)
+	llm = get_chat_model()
+	model = llm.bind_tools(tools)
+	# Replies are only a pure function of the input at temperature 0.
+	use_cache = llm.temperature == 0
+	tool_names = [t.name for t in tools]
 
 	def call_model(state: AgentState):
+		key = None
+		if use_cache:
+			key = LLMCache.make_key(llm.model_name, state["messages"], tool_names)
+			cached = _LLM_CACHE.get(key)
+			if cached is not None:
+				return {"messages": [cached]}
 		response = model.invoke(state["messages"])  # Single turn model call
+		if key is not None:
+			_LLM_CACHE.set(key, response)
 		return {"messages": [response]}
 
 	builder = StateGraph(AgentState)
@@ -30,5 +53,4 @@ def create_agent_graph():
 	builder.add_conditional_edges("model", tools_condition)
 	builder.add_edge("tools", "model")
 
-	memory = MemorySaver()
-	return builder.compile(checkpointer=memory)
\ No newline at end of file
+	return builder.compile(checkpointer=_CHECKPOINTER)
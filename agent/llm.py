@@ -1,27 +1,75 @@
+import asyncio
+import atexit
 import os
+from functools import lru_cache
 from typing import Optional
 
+import httpx
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 
 
 load_dotenv()
 
+_DEFAULT_BASE_URL = "https://api.openai.com/v1"
 
+# Environment is read once at import; get_chat_model is on the per-call path.
+_API_KEY = os.getenv("OPENAI_API_KEY")
+_BASE_URL = os.getenv("OPENAI_BASE_URL")
+_DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# Shared pooled clients so every model call reuses the same TCP+TLS connections.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS)
+_ASYNC_HTTP_CLIENT = httpx.AsyncClient(limits=_HTTP_LIMITS)
+atexit.register(_HTTP_CLIENT.close)
+
+
+@lru_cache(maxsize=4)
 def get_chat_model(temperature: float = 0.0, model_name: Optional[str] = None) -> ChatOpenAI:
 	"""Create a ChatOpenAI model configured from environment variables.
 
+	Models are cached per (temperature, model_name); repeated calls return the same client.
+
 	Environment variables:
 	- OPENAI_API_KEY
 	- OPENAI_MODEL (default: gpt-4o-mini)
 	- OPENAI_BASE_URL (optional)
 	"""
-	api_key = os.getenv("OPENAI_API_KEY")
-	base_url = os.getenv("OPENAI_BASE_URL")
-	resolved_model_name = model_name or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-	if not api_key:
+	resolved_model_name = model_name or _DEFAULT_MODEL
+	if not _API_KEY:
 		raise RuntimeError("OPENAI_API_KEY is not set. Create a .env with your key or export it.")
 
-	if base_url:
-		return ChatOpenAI(api_key=api_key, base_url=base_url, model=resolved_model_name, temperature=temperature)
-	return ChatOpenAI(api_key=api_key, model=resolved_model_name, temperature=temperature)
\ No newline at end of file
+	if _BASE_URL:
+		return ChatOpenAI(
+			api_key=_API_KEY,
+			base_url=_BASE_URL,
+			model=resolved_model_name,
+			temperature=temperature,
+			http_client=_HTTP_CLIENT,
+			http_async_client=_ASYNC_HTTP_CLIENT,
+		)
+	return ChatOpenAI(
+		api_key=_API_KEY,
+		model=resolved_model_name,
+		temperature=temperature,
+		http_client=_HTTP_CLIENT,
+		http_async_client=_ASYNC_HTTP_CLIENT,
+	)
+
+
+async def keep_alive(interval: float = 30.0) -> None:
+	"""Ping the provider's `/models` endpoint periodically to keep the pooled connection warm."""
+	base_url = (_BASE_URL or _DEFAULT_BASE_URL).rstrip("/")
+	headers = {"Authorization": f"Bearer {_API_KEY or ''}"}
+	while True:
+		await asyncio.sleep(interval)
+		try:
+			await _ASYNC_HTTP_CLIENT.get(f"{base_url}/models", headers=headers)
+		except httpx.HTTPError:
+			pass
+
+
+async def aclose_clients() -> None:
+	"""Close the shared async client's pooled connections; await before the event loop exits."""
+	await _ASYNC_HTTP_CLIENT.aclose()
@@ -0,0 +1,51 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Iterable, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+
+def _message_key(message: BaseMessage) -> dict:
+	# Message ids are random per turn and would make every key unique.
+	data = message_to_dict(message)
+	data["data"].pop("id", None)
+	return data
+
+
+class LLMCache:
+	"""In-process LRU cache of model replies keyed by the exact request.
+
+	Only meaningful for deterministic calls (temperature 0); callers decide when to use it.
+	"""
+
+	def __init__(self, maxsize: int = 1024):
+		self.maxsize = maxsize
+		self._entries: "OrderedDict[str, dict]" = OrderedDict()
+
+	@staticmethod
+	def make_key(model_name: str, messages: Sequence[BaseMessage], tool_names: Iterable[str]) -> str:
+		"""Hash the model, serialized message history and bound tool names."""
+		payload = {
+			"model": model_name,
+			"messages": [_message_key(m) for m in messages],
+			"tools": sorted(tool_names),
+		}
+		raw = json.dumps(payload, sort_keys=True, default=str)
+		return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[BaseMessage]:
+		entry = self._entries.get(key)
+		if entry is None:
+			return None
+		self._entries.move_to_end(key)
+		return messages_from_dict([entry])[0]
+
+	def set(self, key: str, message: BaseMessage) -> None:
+		self._entries[key] = _message_key(message)
+		self._entries.move_to_end(key)
+		if len(self._entries) > self.maxsize:
+			self._entries.popitem(last=False)
+
+	def clear(self) -> None:
+		self._entries.clear()
@@ -1,22 +1,63 @@
+import math
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import List
+from functools import wraps
+from typing import Any, Callable, Tuple
 
 from langchain_core.tools import tool
 
 
+def cached_tool(ttl: float, maxsize: int = 4096) -> Callable:
+	"""Cache a tool function's results by arguments for `ttl` seconds (LRU-bounded)."""
+
+	def decorator(func: Callable) -> Callable:
+		cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+
+		@wraps(func)
+		def wrapper(*args, **kwargs):
+			key = (args, tuple(sorted(kwargs.items())))
+			now = time.monotonic()
+			hit = cache.get(key)
+			if hit is not None and now - hit[0] < ttl:
+				cache.move_to_end(key)
+				return hit[1]
+			result = func(*args, **kwargs)
+			cache[key] = (now, result)
+			cache.move_to_end(key)
+			if len(cache) > maxsize:
+				cache.popitem(last=False)
+			return result
+
+		return wrapper
+
+	return decorator
+
+
 @tool
+@cached_tool(ttl=math.inf)
 def add_numbers(a: float, b: float) -> float:
 	"""Add two numbers and return the sum."""
 	return a + b
 
 
 @tool
+@cached_tool(ttl=0.5)
 def current_time_utc() -> str:
 	"""Return the current UTC time as an ISO 8601 string."""
 	now = datetime.now(timezone.utc)
 	return now.isoformat()
 
 
-def get_tools() -> List:
-	"""Return the list of tool callables to bind to the model."""
-	return [add_numbers, current_time_utc]
\ No newline at end of file
+_TOOLS = (add_numbers, current_time_utc)
+_TOOL_TABLE = {t.name: t for t in _TOOLS}
+
+
+def get_tools() -> Tuple:
+	"""Return the tool callables to bind to the model."""
+	return _TOOLS
+
+
+def get_tool(name: str):
+	"""Return the tool registered under `name`, or raise KeyError."""
+	return _TOOL_TABLE[name]
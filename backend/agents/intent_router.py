@@ -1,10 +1,209 @@
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
 from models.schemas import Intent, Subject, Language
 
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; phrase keywords fall back to substring checks
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; patterns fall back to the fused regex
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# Index structures are laid out per category in table order, so every hit count comes
+# back as a float64 vector that lines up with the router's score weights.
+
+class _KeywordIndex(NamedTuple):
+    words: Tuple[frozenset, ...]         # Single-word keywords, one set per category
+    phrases: Dict[str, Tuple[int, ...]]  # Multi-word keyword -> indexes of categories listing it
+    automaton: Any                       # Aho-Corasick automaton over the phrases, if available
+
+def _build_keyword_index(pattern_table: Dict[Any, Dict[str, Any]]) -> _KeywordIndex:
+    """Split keywords into per-category word sets and a shared phrase matcher.
+    
+    Single words are matched against the text's token set; anything else ("tell me",
+    "don't understand") is a phrase matched as a substring.
+    """
+    words: List[set] = []
+    phrases: Dict[str, List[int]] = {}
+    for index, config in enumerate(pattern_table.values()):
+        words.append(set())
+        for keyword in config['keywords']:
+            if _TOKEN_RE.fullmatch(keyword):
+                words[index].add(keyword)
+            else:
+                phrases.setdefault(keyword, []).append(index)
+    
+    automaton = None
+    if ahocorasick is not None and phrases:
+        automaton = ahocorasick.Automaton()
+        for phrase, categories in phrases.items():
+            automaton.add_word(phrase, (phrase, tuple(categories)))
+        automaton.make_automaton()
+    
+    return _KeywordIndex(
+        words=tuple(frozenset(kws) for kws in words),
+        phrases={phrase: tuple(categories) for phrase, categories in phrases.items()},
+        automaton=automaton
+    )
+
+def _keyword_hits(index: _KeywordIndex, text_lower: str) -> np.ndarray:
+    """Count the distinct keywords of each category that occur in the text."""
+    tokens = set(_TOKEN_RE.findall(text_lower))
+    hits = np.fromiter((len(words & tokens) for words in index.words), dtype=np.float64, count=len(index.words))
+    
+    if index.automaton is not None:
+        matched = {value for _, value in index.automaton.iter(text_lower)}
+    else:
+        matched = {(phrase, categories) for phrase, categories in index.phrases.items() if phrase in text_lower}
+    for _, categories in matched:
+        hits[list(categories)] += 1
+    return hits
+
+def _fuse_patterns(expressions: Dict[int, str]) -> Optional[re.Pattern]:
+    """Fuse patterns into one alternation of named groups.
+    
+    Group ``p<id>`` wraps pattern ``id``, so a match's ``lastgroup`` identifies the pattern.
+    The alternation sits inside a lookahead so ``finditer`` tries every start offset instead
+    of skipping past text a previous match consumed.
+    """
+    if not expressions:
+        return None
+    alternatives = [f'(?P<p{pattern_id}>{pattern})' for pattern_id, pattern in expressions.items()]
+    return re.compile('(?=' + '|'.join(alternatives) + ')')
+
+_REGEX_META = set('.^$*+?{}[]|()')
+
+def _as_literal(pattern: str) -> Optional[str]:
+    """Return the plain text a pattern matches if it is a literal, else None."""
+    text = re.sub(r"\\(\W)", r"\1", pattern)  # Escaped punctuation like \' is literal
+    if '\\' in text or any(char in _REGEX_META for char in text):
+        return None
+    return text
+
+class _PatternIndex(NamedTuple):
+    regex: Optional[re.Pattern]             # Fused regex over the non-literal patterns
+    literals: Dict[str, Tuple[int, ...]]    # Literal pattern text -> pattern ids
+    database: Any                           # Hyperscan block-mode database, if available
+    category_ids: np.ndarray                # Pattern id -> category index
+    size: int                               # Number of categories
+
+def _build_pattern_index(pattern_table: Dict[Any, Dict[str, Any]]) -> _PatternIndex:
+    """Compile all patterns into one Hyperscan database, or a fused regex without it.
+    
+    Without Hyperscan, patterns with no regex syntax are split off and checked as plain
+    substrings; only the rest go through the fused regex.
+    """
+    expressions = [pattern for config in pattern_table.values() for pattern in config['patterns']]
+    category_ids = np.array(
+        [index for index, config in enumerate(pattern_table.values()) for _ in config['patterns']],
+        dtype=np.intp
+    )
+    
+    if hyperscan is not None and expressions:
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.encode('utf-8') for pattern in expressions],
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+            )
+            return _PatternIndex(
+                regex=None, literals={}, database=database, category_ids=category_ids, size=len(pattern_table)
+            )
+        except hyperscan.error as e:
+            logger.warning("Hyperscan could not compile patterns, using regex: %s", e)
+    
+    literals: Dict[str, List[int]] = {}
+    regexes: Dict[int, str] = {}
+    for pattern_id, pattern in enumerate(expressions):
+        literal = _as_literal(pattern)
+        if literal is None:
+            regexes[pattern_id] = pattern
+        else:
+            literals.setdefault(literal, []).append(pattern_id)
+    
+    return _PatternIndex(
+        regex=_fuse_patterns(regexes),
+        literals={literal: tuple(pattern_ids) for literal, pattern_ids in literals.items()},
+        database=None,
+        category_ids=category_ids,
+        size=len(pattern_table)
+    )
+
+def _pattern_hits(index: _PatternIndex, text_lower: str) -> np.ndarray:
+    """Count the distinct patterns of each category that occur in the text."""
+    matched = set()
+    if index.database is not None:
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+        
+        index.database.scan(text_lower.encode('utf-8'), match_event_handler=on_match)
+    else:
+        for literal, pattern_ids in index.literals.items():
+            if literal in text_lower:
+                matched.update(pattern_ids)
+        if index.regex is not None:
+            matched.update(int(m.lastgroup[1:]) for m in index.regex.finditer(text_lower))
+    
+    hits = np.bincount(index.category_ids[list(matched)], minlength=index.size)
+    return hits.astype(np.float64)
+
+class RoutingDecision(NamedTuple):
+    """Outcome of routing a single request"""
+    intent: Intent
+    subject: Subject
+    priority: str
+    intent_confidence: float
+    subject_confidence: float
+    overall_confidence: float
+    agent: str
+    requires_context: bool
+    is_urgent: bool
+    estimated_processing_time: float
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Routing as the nested dict shape used for logging and API payloads"""
+        return {
+            'intent': self.intent,
+            'subject': self.subject,
+            'priority': self.priority,
+            'confidence': {
+                'intent': self.intent_confidence,
+                'subject': self.subject_confidence,
+                'overall': self.overall_confidence
+            },
+            'agent': self.agent,
+            'requires_context': self.requires_context,
+            'is_urgent': self.is_urgent,
+            'estimated_processing_time': self.estimated_processing_time
+        }
+
+_DEFAULT_ROUTING = RoutingDecision(
+    intent=Intent.ASK,
+    subject=Subject.GENERAL,
+    priority='normal',
+    intent_confidence=0.0,
+    subject_confidence=0.0,
+    overall_confidence=0.0,
+    agent='teaching_agent',
+    requires_context=True,
+    is_urgent=False,
+    estimated_processing_time=2.0
+)
+
 class IntentRouter:
     """Intent classification and routing agent"""
     
@@ -179,158 +378,189 @@ class IntentRouter:
             'normal': 2,
             'background': 1
         }
+        
+        # Map context subject strings to Subject enum
+        self._subject_mapping = {subject.value: subject for subject in Subject}
+        
+        # Per-category data as parallel arrays in table order, indexed like the score vectors
+        self._intent_order = tuple(self.intent_patterns)
+        self._intent_priorities = tuple(config['priority'] for config in self.intent_patterns.values())
+        priority_vec = np.array(
+            [self.priority_weights.get(priority, 1) for priority in self._intent_priorities],
+            dtype=np.float64
+        )
+        # Priority is static per intent, so fold it into the per-hit weights
+        self._intent_keyword_weights = 0.3 * priority_vec
+        self._intent_pattern_weights = 0.5 * priority_vec
+        self._subject_order = tuple(self.subject_patterns)
+        
+        # One pattern index per table scans the text once for all patterns
+        self._intent_pattern_index = _build_pattern_index(self.intent_patterns)
+        self._subject_pattern_index = _build_pattern_index(self.subject_patterns)
+        
+        # Keyword indexes: token sets for single words, one automaton pass for phrases
+        self._intent_keywords = _build_keyword_index(self.intent_patterns)
+        self._subject_keywords = _build_keyword_index(self.subject_patterns)
+        
+        # Routing outcome for every (intent, subject) pair: (agent, requires_context, estimated time)
+        self._route_table = {
+            (intent, subject): (
+                self._get_target_agent(intent, subject),
+                self._requires_context(intent, subject),
+                self._estimate_processing_time(intent, subject)
+            )
+            for intent in Intent
+            for subject in Subject
+        }
+        
+        # Chat phrases recur constantly, so memoize the pure text scoring
+        self._score_intent = lru_cache(maxsize=4096)(self._score_intent)
+        self._score_subject = lru_cache(maxsize=4096)(self._score_subject)
     
-    async def classify_intent(self, text: str, context: List[Dict[str, Any]] = None) -> Tuple[Intent, float, str]:
+    def classify_intent(
+        self, 
+        text: str, 
+        context: List[Dict[str, Any]] = None, 
+        text_lower: Optional[str] = None
+    ) -> Tuple[Intent, float, str]:
         """Classify user intent with confidence score and priority"""
-        try:
-            if not text.strip():
-                return Intent.ASK, 0.0, 'normal'
-            
-            text_lower = text.lower()
-            intent_scores = {}
-            
-            # Calculate scores for each intent
-            for intent, config in self.intent_patterns.items():
-                score = 0.0
-                
-                # Check keyword matches
-                keyword_matches = sum(1 for keyword in config['keywords'] if keyword in text_lower)
-                if keyword_matches > 0:
-                    score += keyword_matches * 0.3
-                
-                # Check pattern matches
-                pattern_matches = 0
-                for pattern in config['patterns']:
-                    if re.search(pattern, text_lower):
-                        pattern_matches += 1
-                
-                if pattern_matches > 0:
-                    score += pattern_matches * 0.5
-                
-                # Apply priority weight
-                priority_weight = self.priority_weights.get(config['priority'], 1)
-                score *= priority_weight
-                
-                intent_scores[intent] = score
-            
-            # Find best intent
-            if not intent_scores or max(intent_scores.values()) == 0:
-                # Default to ASK if no clear intent
-                best_intent = Intent.ASK
-                confidence = 0.1
-                priority = 'normal'
-            else:
-                best_intent = max(intent_scores, key=intent_scores.get)
-                confidence = min(intent_scores[best_intent] / 2.0, 1.0)  # Normalize to 0-1
-                priority = self.intent_patterns[best_intent]['priority']
-            
-            # Check context for intent hints
-            if context:
-                context_hint = await self._analyze_context_for_intent(context)
-                if context_hint and context_hint != best_intent:
-                    # Adjust confidence based on context
-                    confidence = max(confidence - 0.2, 0.1)
-            
-            logger.info(f"Classified intent: {best_intent} (confidence: {confidence:.2f}, priority: {priority})")
-            return best_intent, confidence, priority
-            
-        except Exception as e:
-            logger.error(f"Error classifying intent: {e}")
+        if not text.strip():
             return Intent.ASK, 0.0, 'normal'
+        
+        best_intent, confidence, priority = self._score_intent(text_lower if text_lower is not None else text.lower())
+        
+        # Check context for intent hints
+        if context:
+            context_hint = self._analyze_context_for_intent(context)
+            if context_hint and context_hint != best_intent:
+                # Adjust confidence based on context
+                confidence = max(confidence - 0.2, 0.1)
+        
+        logger.info("Classified intent: %s (confidence: %.2f, priority: %s)", best_intent, confidence, priority)
+        return best_intent, confidence, priority
     
-    async def classify_subject(self, text: str, context: List[Dict[str, Any]] = None) -> Tuple[Subject, float]:
+    def classify_subject(
+        self, 
+        text: str, 
+        context: List[Dict[str, Any]] = None, 
+        text_lower: Optional[str] = None
+    ) -> Tuple[Subject, float]:
         """Classify subject area with confidence score"""
-        try:
+        if not text.strip():
+            return Subject.GENERAL, 0.0
+        
+        best_subject, confidence = self._score_subject(text_lower if text_lower is not None else text.lower())
+        
+        # Check context for subject hints
+        if context:
+            context_hint = self._analyze_context_for_subject(context)
+            if context_hint and context_hint != best_subject:
+                # Adjust confidence based on context
+                confidence = max(confidence - 0.2, 0.1)
+        
+        logger.info("Classified subject: %s (confidence: %.2f)", best_subject, confidence)
+        return best_subject, confidence
+    
+    def classify_batch(self, texts: List[str]) -> List[Tuple[Intent, float, str]]:
+        """Classify many texts at once without context, e.g. for offline labelling of logs"""
+        if not texts:
+            return []
+        
+        lowered = [text.lower() for text in texts]
+        keyword_matrix = np.stack([_keyword_hits(self._intent_keywords, text_lower) for text_lower in lowered])
+        pattern_matrix = np.stack([_pattern_hits(self._intent_pattern_index, text_lower) for text_lower in lowered])
+        
+        # Weighted sum and argmax for every text in one vectorized step
+        scores = keyword_matrix * self._intent_keyword_weights + pattern_matrix * self._intent_pattern_weights
+        best_indices = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best_indices]
+        confidences = np.minimum(best_scores / 2.0, 1.0)
+        
+        results = []
+        for text, index, score, confidence in zip(texts, best_indices, best_scores, confidences):
             if not text.strip():
-                return Subject.GENERAL, 0.0
-            
-            text_lower = text.lower()
-            subject_scores = {}
-            
-            # Calculate scores for each subject
-            for subject, config in self.subject_patterns.items():
-                score = 0.0
-                
-                # Check keyword matches
-                keyword_matches = sum(1 for keyword in config['keywords'] if keyword in text_lower)
-                if keyword_matches > 0:
-                    score += keyword_matches * 0.4
-                
-                # Check pattern matches
-                pattern_matches = 0
-                for pattern in config['patterns']:
-                    if re.search(pattern, text_lower):
-                        pattern_matches += 1
-                
-                if pattern_matches > 0:
-                    score += pattern_matches * 0.6
-                
-                subject_scores[subject] = score
-            
-            # Find best subject
-            if not subject_scores or max(subject_scores.values()) == 0:
-                best_subject = Subject.GENERAL
-                confidence = 0.1
+                results.append((Intent.ASK, 0.0, 'normal'))
+            elif score == 0:
+                results.append((Intent.ASK, 0.1, 'normal'))
             else:
-                best_subject = max(subject_scores, key=subject_scores.get)
-                confidence = min(subject_scores[best_subject] / 2.0, 1.0)  # Normalize to 0-1
-            
-            # Check context for subject hints
-            if context:
-                context_hint = await self._analyze_context_for_subject(context)
-                if context_hint and context_hint != best_subject:
-                    # Adjust confidence based on context
-                    confidence = max(confidence - 0.2, 0.1)
-            
-            logger.info(f"Classified subject: {best_subject} (confidence: {confidence:.2f})")
-            return best_subject, confidence
-            
-        except Exception as e:
-            logger.error(f"Error classifying subject: {e}")
-            return Subject.GENERAL, 0.0
+                results.append((self._intent_order[index], float(confidence), self._intent_priorities[index]))
+        return results
+    
+    def _score_intent(self, text_lower: str) -> Tuple[Intent, float, str]:
+        """Score intents from the text alone; cached per router, context is applied by the caller"""
+        keyword_hits = _keyword_hits(self._intent_keywords, text_lower)
+        pattern_hits = _pattern_hits(self._intent_pattern_index, text_lower)
+        
+        # Score every intent at once, weighted by priority
+        scores = keyword_hits * self._intent_keyword_weights + pattern_hits * self._intent_pattern_weights
+        best_index = int(scores.argmax())
+        
+        # Find best intent
+        if scores[best_index] == 0:
+            # Default to ASK if no clear intent
+            best_intent = Intent.ASK
+            confidence = 0.1
+            priority = 'normal'
+        else:
+            best_intent = self._intent_order[best_index]
+            confidence = min(float(scores[best_index]) / 2.0, 1.0)  # Normalize to 0-1
+            priority = self._intent_priorities[best_index]
+        
+        return best_intent, confidence, priority
+    
+    def _score_subject(self, text_lower: str) -> Tuple[Subject, float]:
+        """Score subjects from the text alone; cached per router, context is applied by the caller"""
+        keyword_hits = _keyword_hits(self._subject_keywords, text_lower)
+        pattern_hits = _pattern_hits(self._subject_pattern_index, text_lower)
+        
+        # Score every subject at once
+        scores = keyword_hits * 0.4 + pattern_hits * 0.6
+        best_index = int(scores.argmax())
+        
+        # Find best subject
+        if scores[best_index] == 0:
+            best_subject = Subject.GENERAL
+            confidence = 0.1
+        else:
+            best_subject = self._subject_order[best_index]
+            confidence = min(float(scores[best_index]) / 2.0, 1.0)  # Normalize to 0-1
+        
+        return best_subject, confidence
     
-    async def route_request(
+    def route_request(
         self, 
         text: str, 
         context: List[Dict[str, Any]] = None
-    ) -> Dict[str, any]:
+    ) -> RoutingDecision:
         """Route request to appropriate agent based on intent and subject"""
         try:
-            # Classify intent and subject
-            intent, intent_confidence, priority = await self.classify_intent(text, context)
-            subject, subject_confidence = await self.classify_subject(text, context)
+            # Classify intent and subject, lowercasing the text only once
+            text_lower = text.lower()
+            intent, intent_confidence, priority = self.classify_intent(text, context, text_lower)
+            subject, subject_confidence = self.classify_subject(text, context, text_lower)
             
             # Determine routing
-            routing = {
-                'intent': intent,
-                'subject': subject,
-                'priority': priority,
-                'confidence': {
-                    'intent': intent_confidence,
-                    'subject': subject_confidence,
-                    'overall': (intent_confidence + subject_confidence) / 2
-                },
-                'agent': self._get_target_agent(intent, subject),
-                'requires_context': self._requires_context(intent, subject),
-                'is_urgent': priority == 'urgent',
-                'estimated_processing_time': self._estimate_processing_time(intent, subject)
-            }
+            agent, requires_context, estimated_time = self._route_table[(intent, subject)]
+            routing = RoutingDecision(
+                intent=intent,
+                subject=subject,
+                priority=priority,
+                intent_confidence=intent_confidence,
+                subject_confidence=subject_confidence,
+                overall_confidence=(intent_confidence + subject_confidence) / 2,
+                agent=agent,
+                requires_context=requires_context,
+                is_urgent=priority == 'urgent',
+                estimated_processing_time=estimated_time
+            )
             
-            logger.info(f"Routed request: {routing}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Routed request: %s", routing.as_dict())
             return routing
             
         except Exception as e:
-            logger.error(f"Error routing request: {e}")
-            return {
-                'intent': Intent.ASK,
-                'subject': Subject.GENERAL,
-                'priority': 'normal',
-                'confidence': {'intent': 0.0, 'subject': 0.0, 'overall': 0.0},
-                'agent': 'teaching_agent',
-                'requires_context': True,
-                'is_urgent': False,
-                'estimated_processing_time': 2.0
-            }
+            logger.error("Error routing request: %s", e)
+            return _DEFAULT_ROUTING
     
     def _get_target_agent(self, intent: Intent, subject: Subject) -> str:
         """Get target agent based on intent and subject"""
@@ -374,68 +604,45 @@ class IntentRouter:
         
         return base_time * multiplier
     
-    async def _analyze_context_for_intent(self, context: List[Dict[str, Any]]) -> Optional[Intent]:
+    def _analyze_context_for_intent(self, context: List[Dict[str, Any]]) -> Optional[Intent]:
         """Analyze context to provide intent hints"""
-        try:
-            if not context:
-                return None
-            
-            # Look for recent intents in context
-            recent_intents = []
-            for entry in context[-5:]:  # Last 5 entries
-                if entry.get('type') == 'intent':
-                    recent_intents.append(entry.get('content'))
-            
-            # If recent context shows homework checking, likely more homework
-            if any('homework' in intent.lower() for intent in recent_intents):
-                return Intent.CHECK_HOMEWORK
-            
-            # If recent context shows quiz, likely more quiz
-            if any('quiz' in intent.lower() for intent in recent_intents):
-                return Intent.START_QUIZ
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error analyzing context for intent: {e}")
+        if not context:
             return None
+        
+        # Look for recent intents in context, lowercased once as a single buffer
+        recent_intents = " ".join(
+            entry.get('content') or '' for entry in context[-5:]  # Last 5 entries
+            if entry.get('type') == 'intent'
+        ).lower()
+        
+        # If recent context shows homework checking, likely more homework
+        if 'homework' in recent_intents:
+            return Intent.CHECK_HOMEWORK
+        
+        # If recent context shows quiz, likely more quiz
+        if 'quiz' in recent_intents:
+            return Intent.START_QUIZ
+        
+        return None
     
-    async def _analyze_context_for_subject(self, context: List[Dict[str, Any]]) -> Optional[Subject]:
+    def _analyze_context_for_subject(self, context: List[Dict[str, Any]]) -> Optional[Subject]:
         """Analyze context to provide subject hints"""
-        try:
-            if not context:
-                return None
-            
-            # Look for recent subjects in context
-            recent_subjects = []
-            for entry in context[-5:]:  # Last 5 entries
-                if entry.get('type') == 'subject':
-                    recent_subjects.append(entry.get('content'))
-            
-            # Count subject mentions
-            subject_counts = {}
-            for subject in recent_subjects:
-                subject_counts[subject] = subject_counts.get(subject, 0) + 1
-            
-            # Return most frequent subject
-            if subject_counts:
-                most_frequent = max(subject_counts, key=subject_counts.get)
-                # Map string to Subject enum
-                subject_mapping = {
-                    'math': Subject.MATH,
-                    'science': Subject.SCIENCE,
-                    'programming': Subject.PROGRAMMING,
-                    'history': Subject.HISTORY,
-                    'literature': Subject.LITERATURE,
-                    'general': Subject.GENERAL
-                }
-                return subject_mapping.get(most_frequent.lower())
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error analyzing context for subject: {e}")
+        if not context:
             return None
+        
+        # Look for recent subjects in context
+        recent_subjects = []
+        for entry in context[-5:]:  # Last 5 entries
+            if entry.get('type') == 'subject':
+                recent_subjects.append(entry.get('content'))
+        
+        # Return most frequent subject
+        subject_counts = Counter(subject.lower() for subject in recent_subjects if subject)
+        if subject_counts:
+            most_frequent = subject_counts.most_common(1)[0][0]
+            return self._subject_mapping.get(most_frequent)
+        
+        return None
     
     async def get_intent_patterns(self) -> Dict[str, any]:
         """Get all intent patterns for debugging"""
@@ -452,13 +659,27 @@ class IntentRouter:
                 return False
             
             if pattern_type == 'regex':
+                re.compile(pattern)  # Reject invalid patterns before touching the table
                 self.intent_patterns[intent]['patterns'].append(pattern)
+                self._intent_pattern_index = _build_pattern_index(self.intent_patterns)
             elif pattern_type == 'keyword':
                 self.intent_patterns[intent]['keywords'].append(pattern)
+                self._intent_keywords = _build_keyword_index(self.intent_patterns)
+            self._score_intent.cache_clear()
             
-            logger.info(f"Added custom {pattern_type} pattern for {intent}: {pattern}")
+            logger.info("Added custom %s pattern for %s: %s", pattern_type, intent, pattern)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding custom pattern: {e}")
-            return False
\ No newline at end of file
+            logger.error("Error adding custom pattern: %s", e)
+            return False
+
+# Shared router; building the tables and compiling the pattern index is done once per process
+_router: Optional[IntentRouter] = None
+
+def get_router() -> IntentRouter:
+    """Get the shared IntentRouter, creating it on first use"""
+    global _router
+    if _router is None:
+        _router = IntentRouter()
+    return _router
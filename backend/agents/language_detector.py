@@ -1,157 +1,294 @@
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 from models.schemas import Language
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_DEVANAGARI_RE = re.compile('[\u0900-\u097F]+')
+_GUJARATI_RE = re.compile('[\u0A80-\u0AFF]+')
+# Words, keeping Devanagari/Gujarati vowel signs (not \w) but splitting on the danda
+_TOKEN_RE = re.compile('[\\w\u0900-\u0963\u0966-\u097F\u0A80-\u0AFF]+')
+# Languages identified outright by their script, checked in order, and the confidence reported
+_SCRIPT_LANGUAGES = ((_DEVANAGARI_RE, Language.HINDI), (_GUJARATI_RE, Language.GUJARATI))
+_SCRIPT_CONFIDENCE = 0.9
+# Common English misspellings, found anywhere in the lowercased text in one scan
+_MISSPELL_MAP = {
+    'recieve': 'receive',
+    'seperate': 'separate',
+    'definately': 'definitely',
+    'occured': 'occurred'
+}
+_MISSPELL_RE = re.compile('|'.join(map(re.escape, _MISSPELL_MAP)))
+# Normalization tokens: words with inner apostrophes, whitespace runs, everything else
+_NORMALIZE_TOKEN_RE = re.compile(r"\w+(?:'\w+)*|\s+|[^\w\s]+")
+
+# Dialect marker words per language, in priority order, and the fallback dialect
+_DIALECT_MARKERS = {
+    Language.ENGLISH: (
+        ('british', ('colour', 'favour', 'behaviour')),
+        ('southern_american', ('y\'all', 'ain\'t', 'fixin\'')),
+        ('canadian', ('eh', 'aboot', 'soory'))
+    ),
+    Language.SPANISH: (
+        ('argentinian', ('vos', 'che', 'boludo')),
+        ('spain', ('vale', 'tío', 'guay')),
+        ('mexican', ('chido', 'güey', 'órale'))
+    )
+}
+_DEFAULT_DIALECTS = {
+    Language.ENGLISH: 'american',
+    Language.SPANISH: 'general'
+}
+
+@lru_cache(maxsize=4096)
+def _script_counts(text: str) -> Tuple[int, int, int]:
+    """Count ASCII, Devanagari and Gujarati characters, shared by detection and validation."""
+    ascii_count = len(text.encode('ascii', 'ignore'))
+    if ascii_count == len(text):
+        return ascii_count, 0, 0
+    devanagari_count = sum(map(len, _DEVANAGARI_RE.findall(text)))
+    gujarati_count = sum(map(len, _GUJARATI_RE.findall(text)))
+    return ascii_count, devanagari_count, gujarati_count
+
+def _build_dialect_matcher(markers) -> Tuple[re.Pattern, Dict[str, int]]:
+    """Compile a language's marker words into one whole-word regex plus word -> priority rank."""
+    ranks = {word: rank for rank, (_, words) in enumerate(markers) for word in words}
+    alternatives = '|'.join(re.escape(word) for word in ranks)
+    # Lookarounds rather than \b, since markers like "fixin'" end in punctuation
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE), ranks
+
+def _fuse_replacements(table: Dict[str, str]) -> Tuple[re.Pattern, List[str]]:
+    """Fuse a pattern -> expansion table into one whole-word, case-insensitive regex.
+    
+    Group ``n<i>`` wraps the i-th pattern, so ``lastgroup`` picks the expansion and the text
+    is scanned once however many entries the table has.
+    """
+    alternatives = '|'.join(f'(?P<n{i}>{pattern})' for i, pattern in enumerate(table))
+    return re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE), list(table.values())
+
+_REGEX_META = set('.^$*+?{}[]|()\\')
+
+def _literal_word(pattern: str) -> Optional[str]:
+    """Return the word a normalization pattern matches, or None if it needs real regex."""
+    word = pattern.replace(r'\b', '')
+    if not word or any(char in _REGEX_META for char in word):
+        return None
+    return word.lower()
+
+def _build_replacement_lookup(patterns: Dict[str, Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Merge a language's contractions and abbreviations into one lowercase word -> expansion dict.
+    
+    Returns None if a pattern is not a single plain word, so the fused regexes must be used.
+    """
+    lookup = {}
+    for kind in ('contractions', 'abbreviations'):
+        for pattern, expansion in patterns.get(kind, {}).items():
+            word = _literal_word(pattern)
+            if word is None or not _NORMALIZE_TOKEN_RE.fullmatch(word):
+                return None
+            lookup.setdefault(word, expansion)  # Contractions take precedence, as they are applied first
+    return lookup
+
+def _normalize_tokens(lookup: Dict[str, str], text: str) -> str:
+    """Expand words and collapse whitespace in a single tokenizing pass."""
+    parts = []
+    for token in _NORMALIZE_TOKEN_RE.findall(text):
+        if token[0].isspace():
+            parts.append(' ')
+        else:
+            parts.append(lookup.get(token.lower(), token))
+    return ''.join(parts).strip()
+
+# Language detection patterns
+_LANGUAGE_PATTERNS = {
+    Language.ENGLISH: {
+        'indicators': ('the', 'and', 'is', 'are', 'was', 'were', 'have', 'has', 'had'),
+        'contractions': ("don't", "won't", "can't", "isn't", "aren't", "wasn't", "weren't"),
+        'script': 'latin'
+    },
+    Language.HINDI: {
+        'indicators': ('है', 'हैं', 'था', 'थे', 'कर', 'के', 'को', 'से', 'में'),
+        'contractions': (),
+        'script': 'devanagari'
+    },
+    Language.GUJARATI: {
+        'indicators': ('છે', 'છો', 'હતા', 'હતો', 'કર', 'કે', 'કો', 'સે', 'માં'),
+        'contractions': (),
+        'script': 'gujarati'
+    },
+    Language.SPANISH: {
+        'indicators': ('el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se'),
+        'contractions': ("del", "al"),
+        'script': 'latin'
+    },
+    Language.FRENCH: {
+        'indicators': ('le', 'la', 'de', 'que', 'et', 'à', 'en', 'un', 'est', 'se'),
+        'contractions': ("du", "au", "des", "aux"),
+        'script': 'latin'
+    }
+}
+
+# Indicator words as sets, matched against the text's tokens
+_INDICATOR_SETS = {lang: frozenset(config['indicators']) for lang, config in _LANGUAGE_PATTERNS.items()}
+
+# Batch scoring layout: one column per language, in table order
+_LANGUAGE_ORDER = tuple(_LANGUAGE_PATTERNS)
+_INDICATOR_SIZES = np.array(
+    [max(len(_INDICATOR_SETS[lang]), 1) for lang in _LANGUAGE_ORDER], dtype=np.float64
+)
+_LANGUAGE_INDEX = {lang: column for column, lang in enumerate(_LANGUAGE_ORDER)}
+# Columns of the languages written in each script, for adding script bonuses
+_SCRIPT_COLUMNS = {
+    script: np.array([column for column, lang in enumerate(_LANGUAGE_ORDER) if _LANGUAGE_PATTERNS[lang]['script'] == script])
+    for script in ('latin', 'devanagari', 'gujarati')
+}
+
+# Simplified transliteration tables for str.translate, keyed by (from_script, to_script)
+# In production, use a proper transliteration library like indic-transliteration
+_TRANSLITERATION_TABLES = {
+    ('devanagari', 'latin'): str.maketrans({
+        'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu',
+        'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+        'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'ng',
+        'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'ny',
+        'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+        'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+        'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+        'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 'sh',
+        'ष': 'sh', 'स': 's', 'ह': 'h'
+    }),
+    ('gujarati', 'latin'): str.maketrans({
+        'અ': 'a', 'આ': 'aa', 'ઇ': 'i', 'ઈ': 'ii', 'ઉ': 'u', 'ઊ': 'uu',
+        'એ': 'e', 'ઐ': 'ai', 'ઓ': 'o', 'ઔ': 'au',
+        'ક': 'k', 'ખ': 'kh', 'ગ': 'g', 'ઘ': 'gh', 'ઙ': 'ng',
+        'ચ': 'ch', 'છ': 'chh', 'જ': 'j', 'ઝ': 'jh', 'ઞ': 'ny',
+        'ટ': 't', 'ઠ': 'th', 'ડ': 'd', 'ઢ': 'dh', 'ણ': 'n',
+        'ત': 't', 'થ': 'th', 'દ': 'd', 'ધ': 'dh', 'ન': 'n',
+        'પ': 'p', 'ફ': 'ph', 'બ': 'b', 'ભ': 'bh', 'મ': 'm',
+        'ય': 'y', 'ર': 'r', 'લ': 'l', 'વ': 'v', 'શ': 'sh',
+        'ષ': 'sh', 'સ': 's', 'હ': 'h'
+    })
+}
+
+# Text normalization patterns
+_NORMALIZATION_PATTERNS = {
+    Language.ENGLISH: {
+        'contractions': {
+            r"don't": "do not",
+            r"won't": "will not",
+            r"can't": "cannot",
+            r"isn't": "is not",
+            r"aren't": "are not",
+            r"wasn't": "was not",
+            r"weren't": "were not",
+            r"haven't": "have not",
+            r"hasn't": "has not",
+            r"hadn't": "had not",
+            r"wouldn't": "would not",
+            r"couldn't": "could not",
+            r"shouldn't": "should not",
+            r"i'm": "i am",
+            r"you're": "you are",
+            r"he's": "he is",
+            r"she's": "she is",
+            r"it's": "it is",
+            r"we're": "we are",
+            r"they're": "they are",
+            r"i've": "i have",
+            r"you've": "you have",
+            r"we've": "we have",
+            r"they've": "they have",
+            r"i'll": "i will",
+            r"you'll": "you will",
+            r"he'll": "he will",
+            r"she'll": "she will",
+            r"it'll": "it will",
+            r"we'll": "we will",
+            r"they'll": "they will"
+        },
+        'abbreviations': {
+            r"\bmath\b": "mathematics",
+            r"\bsci\b": "science",
+            r"\bprof\b": "professor",
+            r"\bdr\b": "doctor",
+            r"\bmr\b": "mister",
+            r"\bmrs\b": "missus",
+            r"\bms\b": "miss"
+        }
+    },
+    Language.SPANISH: {
+        'contractions': {
+            r"del": "de el",
+            r"al": "a el"
+        },
+        'abbreviations': {
+            r"\bmatemáticas\b": "matemáticas",
+            r"\bciencias\b": "ciencias"
+        }
+    },
+    Language.FRENCH: {
+        'contractions': {
+            r"du": "de le",
+            r"au": "à le",
+            r"des": "de les",
+            r"aux": "à les"
+        },
+        'abbreviations': {
+            r"\bmaths\b": "mathématiques",
+            r"\bsciences\b": "sciences"
+        }
+    }
+}
+
+# Merged word -> expansion lookups for single-pass normalization, where every pattern is a plain word
+_NORMALIZATION_LOOKUPS = {}
+for _language, _patterns in _NORMALIZATION_PATTERNS.items():
+    _lookup = _build_replacement_lookup(_patterns)
+    if _lookup is not None:
+        _NORMALIZATION_LOOKUPS[_language] = _lookup
+del _language, _patterns, _lookup
+
+@lru_cache(maxsize=None)
+def _compiled_normalization(language: Language) -> Dict[str, Tuple[re.Pattern, List[str]]]:
+    """Fused regexes for a language without a word lookup: kind -> (regex, expansions), built on first use"""
+    patterns = _NORMALIZATION_PATTERNS.get(language, {})
+    return {kind: _fuse_replacements(table) for kind, table in patterns.items() if table}
+
+# Dialect marker regexes: language -> (regex, word -> priority rank)
+_DIALECT_MATCHERS = {
+    language: _build_dialect_matcher(markers) for language, markers in _DIALECT_MARKERS.items()
+}
+
 class LanguageDetector:
     """Language detection and text normalization agent"""
     
     def __init__(self):
-        # Language detection patterns
-        self.language_patterns = {
-            Language.ENGLISH: {
-                'indicators': ['the', 'and', 'is', 'are', 'was', 'were', 'have', 'has', 'had'],
-                'contractions': ["don't", "won't", "can't", "isn't", "aren't", "wasn't", "weren't"],
-                'script': 'latin'
-            },
-            Language.HINDI: {
-                'indicators': ['है', 'हैं', 'था', 'थे', 'था', 'कर', 'के', 'को', 'से', 'में'],
-                'contractions': [],
-                'script': 'devanagari'
-            },
-            Language.GUJARATI: {
-                'indicators': ['છે', 'છો', 'હતા', 'હતો', 'કર', 'કે', 'કો', 'સે', 'માં'],
-                'contractions': [],
-                'script': 'gujarati'
-            },
-            Language.SPANISH: {
-                'indicators': ['el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se'],
-                'contractions': ["del", "al"],
-                'script': 'latin'
-            },
-            Language.FRENCH: {
-                'indicators': ['le', 'la', 'de', 'que', 'et', 'à', 'en', 'un', 'est', 'se'],
-                'contractions': ["du", "au", "des", "aux"],
-                'script': 'latin'
-            }
-        }
+        # Tables and derived matchers are built once at import; instances share them
+        self.language_patterns = _LANGUAGE_PATTERNS
+        self.normalization_patterns = _NORMALIZATION_PATTERNS
+        self._indicator_sets = _INDICATOR_SETS
+        self._language_order = _LANGUAGE_ORDER
+        self._indicator_sizes = _INDICATOR_SIZES
+        self._transliteration_tables = _TRANSLITERATION_TABLES
+        self._normalization_lookups = _NORMALIZATION_LOOKUPS
+        self._dialect_matchers = _DIALECT_MATCHERS
         
-        # Text normalization patterns
-        self.normalization_patterns = {
-            Language.ENGLISH: {
-                'contractions': {
-                    r"don't": "do not",
-                    r"won't": "will not",
-                    r"can't": "cannot",
-                    r"isn't": "is not",
-                    r"aren't": "are not",
-                    r"wasn't": "was not",
-                    r"weren't": "were not",
-                    r"haven't": "have not",
-                    r"hasn't": "has not",
-                    r"hadn't": "had not",
-                    r"wouldn't": "would not",
-                    r"couldn't": "could not",
-                    r"shouldn't": "should not",
-                    r"i'm": "i am",
-                    r"you're": "you are",
-                    r"he's": "he is",
-                    r"she's": "she is",
-                    r"it's": "it is",
-                    r"we're": "we are",
-                    r"they're": "they are",
-                    r"i've": "i have",
-                    r"you've": "you have",
-                    r"we've": "we have",
-                    r"they've": "they have",
-                    r"i'll": "i will",
-                    r"you'll": "you will",
-                    r"he'll": "he will",
-                    r"she'll": "she will",
-                    r"it'll": "it will",
-                    r"we'll": "we will",
-                    r"they'll": "they will"
-                },
-                'abbreviations': {
-                    r"\bmath\b": "mathematics",
-                    r"\bsci\b": "science",
-                    r"\bprof\b": "professor",
-                    r"\bdr\b": "doctor",
-                    r"\bmr\b": "mister",
-                    r"\bmrs\b": "missus",
-                    r"\bms\b": "miss"
-                }
-            },
-            Language.SPANISH: {
-                'contractions': {
-                    r"del": "de el",
-                    r"al": "a el"
-                },
-                'abbreviations': {
-                    r"\bmatemáticas\b": "matemáticas",
-                    r"\bciencias\b": "ciencias"
-                }
-            },
-            Language.FRENCH: {
-                'contractions': {
-                    r"du": "de le",
-                    r"au": "à le",
-                    r"des": "de les",
-                    r"aux": "à les"
-                },
-                'abbreviations': {
-                    r"\bmaths\b": "mathématiques",
-                    r"\bsciences\b": "sciences"
-                }
-            }
-        }
+        # Utterances recur in chat, so memoize detection and normalization per text
+        self._detect_language_sync = lru_cache(maxsize=4096)(self._detect_language_sync)
+        self._normalize_text_sync = lru_cache(maxsize=4096)(self._normalize_text_sync)
     
-    async def detect_language(self, text: str, hint: Optional[Language] = None) -> Tuple[Language, float]:
+    def detect_language(self, text: str, hint: Optional[Language] = None) -> Tuple[Language, float]:
         """Detect the language of the given text with confidence score"""
         try:
             if not text.strip():
                 return hint or Language.ENGLISH, 0.0
             
-            text_lower = text.lower()
-            scores = {}
-            
-            # Check each language
-            for lang, config in self.language_patterns.items():
-                score = 0.0
-                total_indicators = len(config['indicators'])
-                
-                # Count indicator words
-                for indicator in config['indicators']:
-                    if indicator in text_lower:
-                        score += 1.0
-                
-                # Normalize score
-                if total_indicators > 0:
-                    score = score / total_indicators
-                
-                # Check script patterns
-                if config['script'] == 'devanagari':
-                    if any('\u0900' <= char <= '\u097F' for char in text):
-                        score += 0.3
-                elif config['script'] == 'gujarati':
-                    if any('\u0A80' <= char <= '\u0AFF' for char in text):
-                        score += 0.3
-                elif config['script'] == 'latin':
-                    if all(ord(char) < 128 for char in text):
-                        score += 0.2
-                
-                scores[lang] = score
-            
-            # Find best match
-            best_lang = max(scores, key=scores.get)
-            confidence = scores[best_lang]
-            
-            # If hint provided and confidence is close, prefer hint
-            if hint and scores.get(hint, 0) >= confidence * 0.8:
-                best_lang = hint
-                confidence = scores[hint]
+            best_lang, confidence = self._detect_language_sync(text, hint)
             
             logger.info(f"Detected language: {best_lang} (confidence: {confidence:.2f})")
             return best_lang, confidence
@@ -160,29 +297,13 @@ class LanguageDetector:
             logger.error(f"Error detecting language: {e}")
             return hint or Language.ENGLISH, 0.0
     
-    async def normalize_text(self, text: str, language: Language) -> str:
+    def normalize_text(self, text: str, language: Language) -> str:
         """Normalize text by expanding contractions and standardizing abbreviations"""
         try:
             if not text.strip():
                 return text
             
-            normalized_text = text
-            
-            # Get normalization patterns for the language
-            patterns = self.normalization_patterns.get(language, {})
-            
-            # Expand contractions
-            contractions = patterns.get('contractions', {})
-            for contraction, expansion in contractions.items():
-                normalized_text = re.sub(contraction, expansion, normalized_text, flags=re.IGNORECASE)
-            
-            # Expand abbreviations
-            abbreviations = patterns.get('abbreviations', {})
-            for abbrev, expansion in abbreviations.items():
-                normalized_text = re.sub(abbrev, expansion, normalized_text, flags=re.IGNORECASE)
-            
-            # Clean up extra spaces
-            normalized_text = re.sub(r'\s+', ' ', normalized_text).strip()
+            normalized_text = self._normalize_text_sync(text, language)
             
             logger.debug(f"Normalized text: '{text[:50]}...' -> '{normalized_text[:50]}...'")
             return normalized_text
@@ -191,49 +312,133 @@ class LanguageDetector:
             logger.error(f"Error normalizing text: {e}")
             return text
     
-    async def transliterate_text(self, text: str, from_script: str, to_script: str) -> str:
-        """Transliterate text between different scripts"""
+    def detect_language_batch(
+        self, 
+        texts: List[str], 
+        hint: Optional[Language] = None
+    ) -> List[Tuple[Language, float]]:
+        """Detect the language of many texts at once, e.g. when classifying a corpus"""
         try:
-            # This is a simplified transliteration
-            # In production, use a proper transliteration library like indic-transliteration
+            if not texts:
+                return []
+            
+            # Indicator hits as a (texts x languages) matrix, normalized per language
+            token_sets = [set(_TOKEN_RE.findall(text.lower())) for text in texts]
+            hits = np.array(
+                [[len(self._indicator_sets[lang] & tokens) for lang in self._language_order] for tokens in token_sets],
+                dtype=np.float64
+            )
+            scores = hits / self._indicator_sizes
+            
+            # Script bonuses, computed once per text and added to every language using that script
+            script_bonus = {
+                'devanagari': 0.3 * np.fromiter((_DEVANAGARI_RE.search(t) is not None for t in texts), bool, len(texts)),
+                'gujarati': 0.3 * np.fromiter((_GUJARATI_RE.search(t) is not None for t in texts), bool, len(texts)),
+                'latin': 0.2 * np.fromiter((t.isascii() for t in texts), bool, len(texts))
+            }
+            for column, lang in enumerate(self._language_order):
+                bonus = script_bonus.get(self.language_patterns[lang]['script'])
+                if bonus is not None:
+                    scores[:, column] += bonus
+            
+            best_columns = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(texts)), best_columns]
+            
+            # If hint provided and confidence is close, prefer hint
+            prefer_hint = np.zeros(len(texts), dtype=bool)
+            if hint in self._language_order:
+                hint_scores = scores[:, self._language_order.index(hint)]
+                prefer_hint = hint_scores >= best_scores * 0.8
+            
+            # Indic script decides outright unless a different language is hinted
+            script_langs = [
+                next((lang for script_re, lang in _SCRIPT_LANGUAGES if script_re.search(text)), None)
+                for text in texts
+            ]
             
-            if from_script == 'devanagari' and to_script == 'latin':
-                # Basic Devanagari to Latin transliteration
-                devanagari_to_latin = {
-                    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu',
-                    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
-                    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'ng',
-                    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'ny',
-                    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
-                    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
-                    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
-                    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 'sh',
-                    'ष': 'sh', 'स': 's', 'ह': 'h'
-                }
-                
-                transliterated = ''
-                for char in text:
-                    transliterated += devanagari_to_latin.get(char, char)
-                return transliterated
+            results = []
+            for row, text in enumerate(texts):
+                script_lang = script_langs[row]
+                if not text.strip():
+                    results.append((hint or Language.ENGLISH, 0.0))
+                elif script_lang is not None and hint in (None, script_lang):
+                    results.append((script_lang, _SCRIPT_CONFIDENCE))
+                elif prefer_hint[row]:
+                    results.append((hint, float(hint_scores[row])))
+                else:
+                    results.append((self._language_order[best_columns[row]], float(best_scores[row])))
+            return results
             
-            elif from_script == 'gujarati' and to_script == 'latin':
-                # Basic Gujarati to Latin transliteration
-                gujarati_to_latin = {
-                    'અ': 'a', 'આ': 'aa', 'ઇ': 'i', 'ઈ': 'ii', 'ઉ': 'u', 'ઊ': 'uu',
-                    'એ': 'e', 'ઐ': 'ai', 'ઓ': 'o', 'ઔ': 'au',
-                    'ક': 'k', 'ખ': 'kh', 'ગ': 'g', 'ઘ': 'gh', 'ઙ': 'ng',
-                    'ચ': 'ch', 'છ': 'chh', 'જ': 'j', 'ઝ': 'jh', 'ઞ': 'ny',
-                    'ટ': 't', 'ઠ': 'th', 'ડ': 'd', 'ઢ': 'dh', 'ણ': 'n',
-                    'ત': 't', 'થ': 'th', 'દ': 'd', 'ધ': 'dh', 'ન': 'n',
-                    'પ': 'p', 'ફ': 'ph', 'બ': 'b', 'ભ': 'bh', 'મ': 'm',
-                    'ય': 'y', 'ર': 'r', 'લ': 'l', 'વ': 'v', 'શ': 'sh',
-                    'ષ': 'sh', 'સ': 's', 'હ': 'h'
-                }
-                
-                transliterated = ''
-                for char in text:
-                    transliterated += gujarati_to_latin.get(char, char)
-                return transliterated
+        except Exception as e:
+            logger.error(f"Error detecting language batch: {e}")
+            return [(hint or Language.ENGLISH, 0.0) for _ in texts]
+    
+    def _detect_language_sync(self, text: str, hint: Optional[Language]) -> Tuple[Language, float]:
+        """Score languages for non-blank text; cached per detector"""
+        # Indic script is near-definitive, so skip scoring unless a different language is hinted
+        for script_re, script_lang in _SCRIPT_LANGUAGES:
+            if script_re.search(text):
+                if hint is None or hint == script_lang:
+                    return script_lang, _SCRIPT_CONFIDENCE
+                break
+        
+        tokens = set(_TOKEN_RE.findall(text.lower()))
+        
+        # Indicator words found, normalized by the number of indicators, one slot per language
+        scores = np.fromiter(
+            (len(indicators & tokens) for indicators in self._indicator_sets.values()),
+            dtype=np.float64, count=len(_LANGUAGE_ORDER)
+        ) / self._indicator_sizes
+        
+        # Check script patterns
+        ascii_count, devanagari_count, gujarati_count = _script_counts(text)
+        if devanagari_count:
+            scores[_SCRIPT_COLUMNS['devanagari']] += 0.3
+        if gujarati_count:
+            scores[_SCRIPT_COLUMNS['gujarati']] += 0.3
+        if ascii_count == len(text):
+            scores[_SCRIPT_COLUMNS['latin']] += 0.2
+        
+        # Find best match
+        best_column = int(scores.argmax())
+        best_lang = _LANGUAGE_ORDER[best_column]
+        confidence = float(scores[best_column])
+        
+        # If hint provided and confidence is close, prefer hint
+        hint_column = _LANGUAGE_INDEX.get(hint)
+        if hint_column is not None and scores[hint_column] >= confidence * 0.8:
+            best_lang = hint
+            confidence = float(scores[hint_column])
+        
+        return best_lang, confidence
+    
+    def _normalize_text_sync(self, text: str, language: Language) -> str:
+        """Expand contractions and abbreviations in non-blank text; cached per detector"""
+        # Expand words and collapse whitespace in one pass when every pattern is a plain word
+        lookup = self._normalization_lookups.get(language)
+        if lookup is not None:
+            return _normalize_tokens(lookup, text)
+        
+        normalized_text = text
+        patterns = _compiled_normalization(language)
+        
+        # Expand contractions, then abbreviations, one scan each
+        for kind in ('contractions', 'abbreviations'):
+            if kind in patterns:
+                regex, expansions = patterns[kind]
+                normalized_text = regex.sub(lambda m: expansions[int(m.lastgroup[1:])], normalized_text)
+        
+        # Clean up extra spaces
+        normalized_text = _WHITESPACE_RE.sub(' ', normalized_text).strip()
+        
+        return normalized_text
+    
+    def transliterate_text(self, text: str, from_script: str, to_script: str) -> str:
+        """Transliterate text between different scripts"""
+        try:
+            table = self._transliteration_tables.get((from_script, to_script))
+            if table is not None:
+                return text.translate(table)
             
             # If no transliteration needed or supported, return original
             return text
@@ -242,53 +447,39 @@ class LanguageDetector:
             logger.error(f"Error transliterating text: {e}")
             return text
     
-    async def detect_dialect(self, text: str, language: Language) -> Optional[str]:
+    def detect_dialect(self, text: str, language: Language) -> Optional[str]:
         """Detect dialect or regional variation of the language"""
         try:
-            if language == Language.ENGLISH:
-                # Detect English dialects
-                if any(word in text.lower() for word in ['colour', 'favour', 'behaviour']):
-                    return 'british'
-                elif any(word in text.lower() for word in ['y\'all', 'ain\'t', 'fixin\'']):
-                    return 'southern_american'
-                elif any(word in text.lower() for word in ['eh', 'aboot', 'soory']):
-                    return 'canadian'
-                else:
-                    return 'american'
-            
-            elif language == Language.SPANISH:
-                # Detect Spanish dialects
-                if any(word in text.lower() for word in ['vos', 'che', 'boludo']):
-                    return 'argentinian'
-                elif any(word in text.lower() for word in ['vale', 'tío', 'guay']):
-                    return 'spain'
-                elif any(word in text.lower() for word in ['chido', 'güey', 'órale']):
-                    return 'mexican'
-                else:
-                    return 'general'
+            if language not in self._dialect_matchers:
+                return None
             
-            return None
+            # One scan finds every marker; the highest-priority dialect among them wins
+            regex, ranks = self._dialect_matchers[language]
+            found = {ranks[word.lower()] for word in regex.findall(text)}
+            if found:
+                return _DIALECT_MARKERS[language][min(found)][0]
+            return _DEFAULT_DIALECTS[language]
             
         except Exception as e:
             logger.error(f"Error detecting dialect: {e}")
             return None
     
-    async def get_language_info(self, language: Language) -> Dict[str, Any]:
+    def get_language_info(self, language: Language) -> Dict[str, Any]:
         """Get information about a specific language"""
         try:
             config = self.language_patterns.get(language, {})
             return {
                 'language': language,
                 'script': config.get('script', 'unknown'),
-                'indicators': config.get('indicators', []),
-                'contractions': config.get('contractions', []),
+                'indicators': config.get('indicators', ()),
+                'contractions': config.get('contractions', ()),
                 'has_normalization': language in self.normalization_patterns
             }
         except Exception as e:
             logger.error(f"Error getting language info: {e}")
             return {}
     
-    async def validate_text(self, text: str, language: Language) -> Dict[str, Any]:
+    def validate_text(self, text: str, language: Language) -> Dict[str, Any]:
         """Validate text for language-specific issues"""
         try:
             issues = []
@@ -297,22 +488,16 @@ class LanguageDetector:
             # Check for mixed scripts
             if language in [Language.HINDI, Language.GUJARATI]:
                 # Check for Latin characters in Indic text
-                latin_chars = sum(1 for char in text if ord(char) < 128)
+                latin_chars = _script_counts(text)[0]
                 if latin_chars > len(text) * 0.3:
                     issues.append('mixed_script')
                     suggestions.append('Consider using consistent script')
             
             # Check for common misspellings
             if language == Language.ENGLISH:
-                common_misspellings = {
-                    'recieve': 'receive',
-                    'seperate': 'separate',
-                    'definately': 'definitely',
-                    'occured': 'occurred'
-                }
-                
-                for misspelling, correction in common_misspellings.items():
-                    if misspelling in text.lower():
+                found = set(_MISSPELL_RE.findall(text.lower()))
+                for misspelling, correction in _MISSPELL_MAP.items():
+                    if misspelling in found:
                         issues.append('misspelling')
                         suggestions.append(f'Did you mean "{correction}"?')
             
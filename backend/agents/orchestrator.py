@@ -1,96 +1,206 @@
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
-from langgraph.graph import StateGraph, END
+import uuid
+import httpx
+from typing import Annotated, AsyncIterator, Dict, FrozenSet, List, Optional, Any, Tuple, TypedDict
 from langgraph.graph.message import add_messages
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 from models.schemas import (
     AudioResponse, TextResponse, QuizResponse, HomeworkResponse,
-    Language, Subject, Intent, Emotion, GestureTag
+    Language, Subject, Intent, Emotion, GestureTag,
+    AgentRequest, TeachingAgentResponse, ResponseSynthesizerInput, ResponseSynthesizerOutput,
+    TTSOutput, AvatarCoordinatorOutput
 )
 from agents.session_manager import SessionManager
 from agents.stt_agent import STTAgent
 from agents.language_detector import LanguageDetector
-from agents.intent_router import IntentRouter
+from agents.intent_router import get_router
 from agents.teaching_agent import TeachingAgent
 from agents.response_synthesizer import ResponseSynthesizer
-from agents.tts_agent import TTSAgent
+from agents.tts_agent import TTSAgent, STREAM_SAMPLE_RATE
 from agents.avatar_coordinator import AvatarCoordinator
+from utils.semantic_cache import SemanticCache
+from utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Language enum by code; members hash as their code, so this also maps a member to itself
+_LANGUAGES_BY_CODE: Dict[str, Language] = {language.value: language for language in Language}
+
+# Seconds a finished avatar render stays fetchable before it is dropped
+_AVATAR_RETENTION_S = 300
+
+# Synthesized audio waiting for the avatar render is held at most this long, and this many at once,
+# so payloads orphaned by a failed request cannot pile up
+_BLOB_RETENTION_S = 60
+_BLOB_STORE_SIZE = 256
+
+def _language_fields(language: Optional[Any]) -> Dict[str, Any]:
+    """State fields for a language given as an enum member or code, coerced once at the boundary"""
+    if language is None:
+        return {"language": None, "language_code": None}
+    if language not in _LANGUAGES_BY_CODE:
+        raise ValueError(f"{language!r} is not a valid Language")
+    language = _LANGUAGES_BY_CODE[language]
+    return {"language": language, "language_code": language.value}
+
+def _keep_first_error(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """Reducer for the error field: parallel branches may both fail, and the first error wins"""
+    return current or update
+
+class FinalResponse(TypedDict, total=False):
+    """Reply assembled by the last pipeline node, or by the error handler"""
+    text: str
+    summary: Optional[str]
+    confidence: float
+    need_steps: bool
+    citations: List[str]
+    voice_style: str
+    emotion: Emotion
+    gesture_tag: GestureTag
+    emphasis_spans: List[Dict[str, int]]
+    video_url: Optional[str]
+
+class AgentState(TypedDict, total=False):
+    """State shared by the graph nodes; fields are last-write-wins unless annotated with a reducer"""
+    messages: Annotated[List[BaseMessage], add_messages]
+    session_id: Optional[str]
+    user_id: Optional[str]
+    audio_data: Optional[bytes]
+    transcript: Optional[str]
+    language: Optional[Language]
+    language_code: Optional[str]
+    confidence: float
+    timings: List[Dict[str, float]]
+    normalized_text: Optional[str]
+    intent: Optional[Intent]
+    subject: Optional[Subject]
+    priority: Optional[str]
+    context: List[Dict[str, Any]]
+    teaching_response: Optional[TeachingAgentResponse]
+    synthesized_response: Optional[ResponseSynthesizerOutput]
+    tts_output: Optional[TTSOutput]
+    audio_blob_id: Optional[str]
+    avatar_output: Optional[AvatarCoordinatorOutput]
+    final_response: Optional[FinalResponse]
+    error: Annotated[Optional[str], _keep_first_error]
+
+# Pipeline topology: each node with the upstream nodes it waits for, in topological order.
+# The execution plans for every entry point are derived from this table.
+_PIPELINE: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("session_create", ()),
+    ("session_context", ("session_create",)),
+    ("stt_agent", ("session_create",)),
+    ("language_detector", ("stt_agent",)),
+    ("intent_router", ("stt_agent", "session_context")),
+    ("teaching_agent", ("language_detector", "intent_router")),
+    ("response_synthesizer", ("teaching_agent",)),
+    ("tts_agent", ("response_synthesizer",)),
+    ("avatar_coordinator", ("tts_agent",)),
+)
+# Speech and avatar nodes, left out of plans whose caller produces media itself
+_MEDIA_NODES = frozenset({"tts_agent", "avatar_coordinator"})
+# Nodes that are dead for text input: no audio to transcribe, and a caller-supplied language
+# needs no detection
+_TEXT_SKIPPED_NODES = frozenset({"stt_agent"})
+_TEXT_WITH_LANGUAGE_SKIPPED_NODES = _TEXT_SKIPPED_NODES | {"language_detector"}
+
+def _specialize(skipped: FrozenSet[str]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """The pipeline without the skipped nodes; their dependents wait on what the skipped nodes waited on"""
+    rewired: Dict[str, Tuple[str, ...]] = {}
+    ancestors: Dict[str, FrozenSet[str]] = {}
+    pipeline = []
+    for node, upstream in _PIPELINE:
+        resolved = tuple(dict.fromkeys(name for dep in upstream for name in rewired.get(dep, (dep,))))
+        if node in skipped:
+            rewired[node] = resolved
+            continue
+        
+        # An upstream node another upstream node already waits on adds nothing to the join
+        resolved = tuple(name for name in resolved if not any(name in ancestors[other] for other in resolved))
+        ancestors[node] = frozenset(resolved).union(*(ancestors[name] for name in resolved))
+        pipeline.append((node, resolved))
+    return tuple(pipeline)
+
+def _plan_levels(pipeline: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> List[List[str]]:
+    """Group nodes into levels that can run concurrently: one past the deepest upstream node"""
+    depth: Dict[str, int] = {}
+    levels: List[List[str]] = []
+    for node, upstream in pipeline:
+        depth[node] = max((depth[name] + 1 for name in upstream), default=0)
+        if depth[node] == len(levels):
+            levels.append([])
+        levels[depth[node]].append(node)
+    return levels
+
 class AgentOrchestrator:
     """Main orchestrator that coordinates all agents using LangGraph"""
     
     def __init__(self, openai_api_key: str = None):
+        # One connection pool for outbound API calls, shared by the agents that make them
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            timeout=30.0
+        )
+        
         # Initialize all agents
         self.session_manager = SessionManager()
         self.stt_agent = STTAgent()
         self.language_detector = LanguageDetector()
-        self.intent_router = IntentRouter()
+        self.intent_router = get_router()
         self.teaching_agent = TeachingAgent(openai_api_key)
         self.response_synthesizer = ResponseSynthesizer()
-        self.tts_agent = TTSAgent(openai_api_key)
-        self.avatar_coordinator = AvatarCoordinator()
-        
-        # Build the agent graph
-        self.graph = self._build_agent_graph()
-    
-    def _build_agent_graph(self) -> StateGraph:
-        """Build the LangGraph workflow for agent coordination"""
-        
-        # Define the state structure
-        class AgentState:
-            def __init__(self):
-                self.messages: List[BaseMessage] = []
-                self.session_id: Optional[str] = None
-                self.user_id: Optional[str] = None
-                self.audio_data: Optional[bytes] = None
-                self.transcript: Optional[str] = None
-                self.language: Optional[Language] = None
-                self.normalized_text: Optional[str] = None
-                self.intent: Optional[Intent] = None
-                self.subject: Optional[Subject] = None
-                self.priority: Optional[str] = None
-                self.context: List[Dict[str, Any]] = []
-                self.teaching_response: Optional[Dict[str, Any]] = None
-                self.synthesized_response: Optional[Dict[str, Any]] = None
-                self.tts_output: Optional[Dict[str, Any]] = None
-                self.avatar_output: Optional[Dict[str, Any]] = None
-                self.final_response: Optional[Dict[str, Any]] = None
-                self.error: Optional[str] = None
+        self.tts_agent = TTSAgent(openai_api_key, http_client=self._http)
+        self.avatar_coordinator = AvatarCoordinator(http_client=self._http)
         
-        # Create the graph
-        workflow = StateGraph(AgentState)
+        # Teaching responses reused for near-identical questions in the same subject and language
+        self._semantic_cache = SemanticCache(threshold=0.93)
         
-        # Add nodes for each agent
-        workflow.add_node("session_manager", self._session_manager_node)
-        workflow.add_node("stt_agent", self._stt_agent_node)
-        workflow.add_node("language_detector", self._language_detector_node)
-        workflow.add_node("intent_router", self._intent_router_node)
-        workflow.add_node("teaching_agent", self._teaching_agent_node)
-        workflow.add_node("response_synthesizer", self._response_synthesizer_node)
-        workflow.add_node("tts_agent", self._tts_agent_node)
-        workflow.add_node("avatar_coordinator", self._avatar_coordinator_node)
-        workflow.add_node("error_handler", self._error_handler_node)
+        # Session context reused across a burst of turns; dropped whenever the session writes to it
+        self._ctx_cache = TTLCache(maxsize=10000, ttl=30)
+        self.session_manager.on_context_change(self._ctx_cache.pop)
         
-        # Define the workflow edges
-        workflow.set_entry_point("session_manager")
+        # Synthesized audio kept out of graph state; state carries only the blob id
+        self._blob_store = TTLCache(maxsize=_BLOB_STORE_SIZE, ttl=_BLOB_RETENTION_S)
         
-        # Audio processing flow
-        workflow.add_edge("session_manager", "stt_agent")
-        workflow.add_edge("stt_agent", "language_detector")
-        workflow.add_edge("language_detector", "intent_router")
-        workflow.add_edge("intent_router", "teaching_agent")
-        workflow.add_edge("teaching_agent", "response_synthesizer")
-        workflow.add_edge("response_synthesizer", "tts_agent")
-        workflow.add_edge("tts_agent", "avatar_coordinator")
-        workflow.add_edge("avatar_coordinator", END)
+        # Avatar renders run off the response path; clients fetch them by id once ready
+        self._pending_avatars: Dict[str, asyncio.Task] = {}
         
-        # Error handling
-        workflow.add_edge("error_handler", END)
+        self._nodes = {
+            "session_create": self._session_create_node,
+            "session_context": self._session_context_node,
+            "stt_agent": self._stt_agent_node,
+            "language_detector": self._language_detector_node,
+            "intent_router": self._intent_router_node,
+            "teaching_agent": self._teaching_agent_node,
+            "response_synthesizer": self._response_synthesizer_node,
+            "tts_agent": self._tts_agent_node,
+            "avatar_coordinator": self._avatar_coordinator_node,
+            "error_handler": self._error_handler_node
+        }
         
-        return workflow.compile()
+        # Level-by-level execution plans: the full pipeline for audio, and for text the pipeline
+        # without the nodes that are dead for it. Text plans are keyed by (language known, with media)
+        self._levels = _plan_levels(_PIPELINE)
+        self._text_levels = {
+            (known, with_media): _plan_levels(_specialize(
+                (_TEXT_WITH_LANGUAGE_SKIPPED_NODES if known else _TEXT_SKIPPED_NODES)
+                | (frozenset() if with_media else _MEDIA_NODES)
+            ))
+            for known in (True, False)
+            for with_media in (True, False)
+        }
+    
+    async def warmup(self) -> None:
+        """Open API connections at startup so the first request skips the TLS handshake"""
+        await asyncio.gather(self.tts_agent.warmup())
+    
+    async def aclose(self) -> None:
+        """Cancel outstanding avatar renders and close the shared connection pool"""
+        for task in self._pending_avatars.values():
+            task.cancel()
+        self._pending_avatars.clear()
+        await self._http.aclose()
     
     async def process_audio(
         self,
@@ -104,11 +214,11 @@ class AgentOrchestrator:
             initial_state = {
                 "audio_data": audio_data,
                 "session_id": session_id,
-                "language": language_hint
+                **_language_fields(language_hint)
             }
             
-            # Run the graph
-            result = await self.graph.ainvoke(initial_state)
+            # Run the pipeline
+            result = await self._execute_plan(initial_state, self._levels)
             
             # Extract and return the final response
             if result.get("error"):
@@ -134,35 +244,132 @@ class AgentOrchestrator:
         """Process text input through the pipeline"""
         try:
             # Create initial state
-            initial_state = {
-                "transcript": text,
-                "session_id": session_id,
-                "language": language or Language.ENGLISH
-            }
+            initial_state, levels = self._text_request(text, session_id, language, with_media=True)
             
-            # Run the graph
-            result = await self.graph.ainvoke(initial_state)
+            # Run the pipeline
+            result = await self._execute_plan(initial_state, levels)
             
             # Extract and return the final response
             if result.get("error"):
                 raise Exception(result["error"])
             
-            return TextResponse(
-                text=result.get("final_response", {}).get("text", ""),
-                summary=result.get("final_response", {}).get("summary"),
-                confidence=result.get("final_response", {}).get("confidence", 0.0),
-                need_steps=result.get("final_response", {}).get("need_steps", False),
-                citations=result.get("final_response", {}).get("citations", []),
-                voice_style=result.get("final_response", {}).get("voice_style", "friendly_male"),
-                emotion=result.get("final_response", {}).get("emotion", Emotion.NEUTRAL),
-                gesture_tag=result.get("final_response", {}).get("gesture_tag", GestureTag.AFFIRMATIVE),
-                emphasis_spans=result.get("final_response", {}).get("emphasis_spans", [])
-            )
+            return TextResponse.from_final(result.get("final_response") or {})
             
         except Exception as e:
             logger.error(f"Error processing text: {e}")
             raise
     
+    async def stream_text_reply(
+        self,
+        text: str,
+        session_id: str,
+        language: Optional[Language] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Process text input and stream the reply: the text first, then audio frames as they are synthesized.
+        
+        Yields ``{"type": "text", "data": TextResponse}``, then ``{"type": "audio_chunk", "data": bytes}``
+        frames of raw PCM, then ``{"type": "audio_end", "sample_rate": int}``. The avatar is not
+        rendered on this path, as it needs the complete phoneme timeline.
+        """
+        initial_state, levels = self._text_request(text, session_id, language, with_media=False)
+        result = await self._execute_plan(initial_state, levels)
+        if result.get("error"):
+            raise Exception(result["error"])
+        
+        synthesized_response = result["synthesized_response"]
+        teaching_response = result["teaching_response"]
+        yield {
+            "type": "text",
+            "data": TextResponse(
+                text=synthesized_response.text,
+                summary=teaching_response.summary,
+                confidence=teaching_response.confidence,
+                need_steps=teaching_response.need_steps,
+                citations=teaching_response.citations,
+                voice_style=synthesized_response.voice_style,
+                emotion=synthesized_response.emotion,
+                gesture_tag=synthesized_response.gesture_tag,
+                emphasis_spans=synthesized_response.emphasis_spans
+            )
+        }
+        
+        async for chunk in self.tts_agent.stream_speech(
+            text=synthesized_response.text,
+            voice_style=synthesized_response.voice_style,
+            language=result["language"]
+        ):
+            yield {"type": "audio_chunk", "data": chunk}
+        
+        yield {"type": "audio_end", "sample_rate": STREAM_SAMPLE_RATE}
+    
+    def _text_request(
+        self,
+        text: str,
+        session_id: str,
+        language: Optional[Language],
+        with_media: bool
+    ) -> Tuple[Dict[str, Any], List[List[str]]]:
+        """Initial state and plan for text input; a caller-supplied language skips detection"""
+        state = {
+            "transcript": text,
+            "session_id": session_id,
+            **_language_fields(language)
+        }
+        known = state["language"] is not None
+        if known:
+            # Normalization would otherwise come from the skipped language detector
+            state["normalized_text"] = self.language_detector.normalize_text(text, state["language"])
+        return state, self._text_levels[(known, with_media)]
+    
+    async def process_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_inflight: int = 32
+    ) -> List[Any]:
+        """Process many text requests concurrently, returning results in request order.
+        
+        Each request is a dict of ``process_text`` arguments; a failed request yields its
+        exception in place of a TextResponse.
+        """
+        return await asyncio.gather(
+            *self._bounded_text_requests(requests, max_inflight),
+            return_exceptions=True
+        )
+    
+    async def process_text_stream(
+        self,
+        requests: List[Dict[str, Any]],
+        max_inflight: int = 32
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Process many text requests concurrently, yielding (index, result) as each finishes"""
+        async def indexed(index: int, request) -> Tuple[int, Any]:
+            try:
+                return index, await request
+            except Exception as e:
+                return index, e
+        
+        tasks = [
+            asyncio.ensure_future(indexed(index, request))
+            for index, request in enumerate(self._bounded_text_requests(requests, max_inflight))
+        ]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            # Stop outstanding requests if the consumer stops iterating early
+            for task in tasks:
+                task.cancel()
+    
+    def _bounded_text_requests(self, requests: List[Dict[str, Any]], max_inflight: int) -> List[Any]:
+        """Wrap each text request in a coroutine that shares one concurrency limit"""
+        semaphore = asyncio.Semaphore(max_inflight)
+        
+        async def run(request: Dict[str, Any]) -> TextResponse:
+            async with semaphore:
+                return await self.process_text(**request)
+        
+        return [run(request) for request in requests]
+    
     async def generate_quiz(
         self,
         topic: str,
@@ -174,8 +381,6 @@ class AgentOrchestrator:
         try:
             # This would be a specialized flow for quiz generation
             # For now, we'll use the teaching agent
-            from models.schemas import AgentRequest
-            
             request = AgentRequest(
                 session_id=session_id,
                 user_id="quiz_user",
@@ -223,28 +428,92 @@ class AgentOrchestrator:
             logger.error(f"Error checking homework: {e}")
             raise
     
+    async def _execute_plan(self, state: Dict[str, Any], levels: List[List[str]]) -> Dict[str, Any]:
+        """Run the pipeline level by level with asyncio.gather.
+        
+        Nodes in a level see the state left by the previous level, the first error wins, and a
+        failed level hands over to the error handler.
+        """
+        state = dict(state)
+        for level in levels:
+            if len(level) == 1:
+                # Sequential stretch: await the node inline rather than scheduling a task for it
+                updates = [await self._nodes[level[0]](state)]
+            else:
+                updates = await asyncio.gather(*(self._nodes[node](state) for node in level))
+            for update in updates:
+                for key, value in update.items():
+                    if key == "error":
+                        state["error"] = state.get("error") or value
+                    else:
+                        state[key] = value
+            
+            if state.get("error"):
+                state.update(await self._error_handler_node(state))
+                break
+        return state
+    
+    async def get_avatar(self, avatar_id: str) -> Optional[AvatarCoordinatorOutput]:
+        """Wait for a detached avatar render and hand over its output
+        
+        The render is shielded, so a client that disconnects while waiting does not cancel it.
+        """
+        task = self._pending_avatars.get(avatar_id)
+        if task is None:
+            return None
+        
+        avatar_output = await asyncio.shield(task)
+        self._pending_avatars.pop(avatar_id, None)
+        return avatar_output
+    
+    def _expire_avatar(self, avatar_id: str) -> None:
+        # Finished renders stay fetchable for a while, then go even if nobody asked for them
+        asyncio.get_running_loop().call_later(_AVATAR_RETENTION_S, self._pending_avatars.pop, avatar_id, None)
+    
+    def _register_blob(self, data: bytes) -> str:
+        """Store a payload by reference and return the id passed through graph state"""
+        blob_id = uuid.uuid4().hex
+        self._blob_store.set(blob_id, data)
+        return blob_id
+    
+    def _take_blob(self, blob_id: Optional[str]) -> Optional[bytes]:
+        """Remove a registered payload and return it, once its consumer has it"""
+        return self._blob_store.pop(blob_id) if blob_id else None
+    
     # Node implementations for the graph
-    async def _session_manager_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Session manager node"""
+    async def _session_create_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Session creation node; runs first so later nodes always have a session id"""
+        try:
+            session_id = state.get("session_id")
+            if session_id:
+                return {}
+            
+            # Create new session
+            session = await self.session_manager.create_session(
+                user_id="anonymous",
+                language=state.get("language") or Language.ENGLISH
+            )
+            return {"session_id": session.session_id}
+        except Exception as e:
+            logger.error(f"Error in session create node: {e}")
+            return {"error": str(e)}
+    
+    async def _session_context_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Session context node; runs alongside STT"""
         try:
             session_id = state.get("session_id")
             if not session_id:
-                # Create new session
-                session = await self.session_manager.create_session(
-                    user_id="anonymous",
-                    language=state.get("language", Language.ENGLISH)
-                )
-                session_id = session.session_id
+                return {"error": "No session available"}
             
-            # Get session context
-            context = await self.session_manager.get_context(session_id)
+            # Get session context, from the short-lived cache when the session was seen recently
+            context = self._ctx_cache.get(session_id)
+            if context is None:
+                context = await self.session_manager.get_context(session_id)
+                self._ctx_cache.set(session_id, context)
             
-            return {
-                "session_id": session_id,
-                "context": context
-            }
+            return {"context": context}
         except Exception as e:
-            logger.error(f"Error in session manager node: {e}")
+            logger.error(f"Error in session context node: {e}")
             return {"error": str(e)}
     
     async def _stt_agent_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -262,7 +531,7 @@ class AgentOrchestrator:
             
             return {
                 "transcript": result.transcript,
-                "language": result.language,
+                **_language_fields(result.language),
                 "confidence": result.confidence,
                 "timings": result.timings
             }
@@ -278,16 +547,16 @@ class AgentOrchestrator:
                 return {"error": "No transcript provided"}
             
             language_hint = state.get("language")
-            detected_language, confidence = await self.language_detector.detect_language(
+            detected_language, confidence = self.language_detector.detect_language(
                 transcript, language_hint
             )
             
-            normalized_text = await self.language_detector.normalize_text(
+            normalized_text = self.language_detector.normalize_text(
                 transcript, detected_language
             )
             
             return {
-                "language": detected_language,
+                **_language_fields(detected_language),
                 "normalized_text": normalized_text
             }
         except Exception as e:
@@ -297,17 +566,20 @@ class AgentOrchestrator:
     async def _intent_router_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Intent router node"""
         try:
+            if state.get("error"):
+                return {}
+            
             text = state.get("normalized_text") or state.get("transcript")
             if not text:
                 return {"error": "No text provided"}
             
             context = state.get("context", [])
-            routing = await self.intent_router.route_request(text, context)
+            routing = self.intent_router.route_request(text, context)
             
             return {
-                "intent": routing["intent"],
-                "subject": routing["subject"],
-                "priority": routing["priority"]
+                "intent": routing.intent,
+                "subject": routing.subject,
+                "priority": routing.priority
             }
         except Exception as e:
             logger.error(f"Error in intent router node: {e}")
@@ -316,32 +588,38 @@ class AgentOrchestrator:
     async def _teaching_agent_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Teaching agent node"""
         try:
+            if state.get("error"):
+                return {}
+            
             text = state.get("normalized_text") or state.get("transcript")
             if not text:
                 return {"error": "No text provided"}
             
-            from models.schemas import AgentRequest
-            
             request = AgentRequest(
                 session_id=state["session_id"],
                 user_id="user",
                 text=text,
-                language=state.get("language", Language.ENGLISH).value,
+                language=state.get("language_code") or Language.ENGLISH.value,
                 subject=state.get("subject", Subject.GENERAL),
                 context=state.get("context", [])
             )
             
+            # Serve a cached answer when an equivalent question was already asked
+            cache_key = (request.subject, request.language)
+            embedding = None
+            if self._semantic_cache.enabled:
+                embedding = await asyncio.to_thread(self._semantic_cache.embed, text)
+                cached = self._semantic_cache.lookup(embedding, cache_key)
+                if cached is not None:
+                    return {"teaching_response": cached}
+            
             response = await self.teaching_agent.generate_response(request)
             
-            return {
-                "teaching_response": {
-                    "text": response.text,
-                    "summary": response.summary,
-                    "confidence": response.confidence,
-                    "need_steps": response.need_steps,
-                    "citations": response.citations
-                }
-            }
+            # Zero confidence marks the agent's error fallback, which is not worth reusing
+            if embedding is not None and response.confidence > 0:
+                self._semantic_cache.add(embedding, cache_key, response)
+            
+            return {"teaching_response": response}
         except Exception as e:
             logger.error(f"Error in teaching agent node: {e}")
             return {"error": str(e)}
@@ -353,28 +631,17 @@ class AgentOrchestrator:
             if not teaching_response:
                 return {"error": "No teaching response provided"}
             
-            from models.schemas import ResponseSynthesizerInput
-            
             input_data = ResponseSynthesizerInput(
-                text=teaching_response["text"],
+                text=teaching_response.text,
                 voice_style="friendly_male",
-                language=state.get("language", Language.ENGLISH).value,
+                language=state.get("language_code") or Language.ENGLISH.value,
                 emotion=Emotion.ENCOURAGING,
                 gesture_tag=GestureTag.AFFIRMATIVE
             )
             
             response = await self.response_synthesizer.synthesize_response(input_data)
             
-            return {
-                "synthesized_response": {
-                    "text": response.text,
-                    "voice_style": response.voice_style,
-                    "language": response.language,
-                    "emotion": response.emotion,
-                    "gesture_tag": response.gesture_tag,
-                    "emphasis_spans": response.emphasis_spans
-                }
-            }
+            return {"synthesized_response": response}
         except Exception as e:
             logger.error(f"Error in response synthesizer node: {e}")
             return {"error": str(e)}
@@ -387,17 +654,17 @@ class AgentOrchestrator:
                 return {"error": "No synthesized response provided"}
             
             tts_output = await self.tts_agent.synthesize_speech(
-                text=synthesized_response["text"],
-                voice_style=synthesized_response["voice_style"],
-                language=Language(synthesized_response["language"]),
-                emotion=synthesized_response["emotion"]
+                text=synthesized_response.text,
+                voice_style=synthesized_response.voice_style,
+                language=state.get("language") or Language.ENGLISH,
+                emotion=synthesized_response.emotion
             )
             
+            # Keep the audio bytes out of state; downstream nodes look them up by id
+            blob_id = self._register_blob(tts_output.audio_data)
             return {
-                "tts_output": {
-                    "audio_data": tts_output.audio_data,
-                    "phoneme_timestamps": tts_output.phoneme_timestamps
-                }
+                "tts_output": tts_output.model_copy(update={"audio_data": None}),
+                "audio_blob_id": blob_id
             }
         except Exception as e:
             logger.error(f"Error in TTS agent node: {e}")
@@ -412,46 +679,37 @@ class AgentOrchestrator:
             if not tts_output or not synthesized_response:
                 return {"error": "Missing TTS or synthesized response"}
             
-            from models.schemas import TTSOutput, ResponseSynthesizerOutput
-            
-            tts_data = TTSOutput(
-                audio_data=tts_output["audio_data"],
-                phoneme_timestamps=tts_output["phoneme_timestamps"]
-            )
-            
-            response_data = ResponseSynthesizerOutput(
-                text=synthesized_response["text"],
-                voice_style=synthesized_response["voice_style"],
-                language=synthesized_response["language"],
-                emotion=synthesized_response["emotion"],
-                gesture_tag=synthesized_response["gesture_tag"],
-                emphasis_spans=synthesized_response["emphasis_spans"]
+            # Render in the background so the response is not held up by video generation. The
+            # render is the audio's last consumer, so the blob is released as it is handed over
+            avatar_id = uuid.uuid4().hex
+            audio_data = self._take_blob(state.get("audio_blob_id"))
+            task = asyncio.create_task(
+                self.avatar_coordinator.generate_avatar(
+                    tts_output=tts_output.model_copy(update={"audio_data": audio_data}),
+                    response_data=synthesized_response
+                )
             )
-            
-            avatar_output = await self.avatar_coordinator.generate_avatar(
-                tts_output=tts_data,
-                response_data=response_data
+            task.add_done_callback(lambda _: self._expire_avatar(avatar_id))
+            self._pending_avatars[avatar_id] = task
+            avatar_output = AvatarCoordinatorOutput(
+                video_url=f"/api/avatar/{avatar_id}",
+                status="pending"
             )
             
+            teaching_response = state["teaching_response"]
             return {
-                "avatar_output": {
-                    "video_url": avatar_output.video_url,
-                    "webrtc_token": avatar_output.webrtc_token,
-                    "expected_delay_ms": avatar_output.expected_delay_ms,
-                    "gesture_timeline": avatar_output.gesture_timeline
-                },
+                "avatar_output": avatar_output,
                 "final_response": {
-                    "text": synthesized_response["text"],
-                    "summary": state.get("teaching_response", {}).get("summary"),
-                    "confidence": state.get("teaching_response", {}).get("confidence", 0.0),
-                    "need_steps": state.get("teaching_response", {}).get("need_steps", False),
-                    "citations": state.get("teaching_response", {}).get("citations", []),
-                    "voice_style": synthesized_response["voice_style"],
-                    "emotion": synthesized_response["emotion"],
-                    "gesture_tag": synthesized_response["gesture_tag"],
-                    "emphasis_spans": synthesized_response["emphasis_spans"],
-                    "video_url": avatar_output.video_url,
-                    "audio_data": tts_output["audio_data"]
+                    "text": synthesized_response.text,
+                    "summary": teaching_response.summary,
+                    "confidence": teaching_response.confidence,
+                    "need_steps": teaching_response.need_steps,
+                    "citations": teaching_response.citations,
+                    "voice_style": synthesized_response.voice_style,
+                    "emotion": synthesized_response.emotion,
+                    "gesture_tag": synthesized_response.gesture_tag,
+                    "emphasis_spans": synthesized_response.emphasis_spans,
+                    "video_url": avatar_output.video_url
                 }
             }
         except Exception as e:
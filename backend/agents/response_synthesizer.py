@@ -1,13 +1,60 @@
 import re
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Any, Tuple
+
+import numpy as np
 from models.schemas import (
     Emotion, GestureTag, ResponseSynthesizerInput, ResponseSynthesizerOutput,
     Language, Persona
 )
 
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; gesture triggers fall back to substring checks
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Score multiplier per gesture frequency
+_FREQUENCY_WEIGHTS = {'high': 2, 'medium': 1.5, 'low': 1}
+
+# Voice delivery changes per emotion
+_EMOTION_VOICE_MODIFICATIONS = {
+    Emotion.ENCOURAGING: {'rate': 'fast', 'volume': 'high'},
+    Emotion.CALM: {'rate': 'slow', 'volume': 'low'},
+    Emotion.EXCITED: {'rate': 'fast', 'volume': 'high'},
+    Emotion.CORRECTIVE: {'rate': 'slow', 'volume': 'medium'},
+    Emotion.NEUTRAL: {}  # No modifications
+}
+
+# Gesture timing per emotion intensity: gestures per word and seconds each gesture lasts
+_GESTURE_INTENSITY_PARAMS = {
+    'low': {'frequency': 0.3, 'duration': 0.5},
+    'medium': {'frequency': 0.5, 'duration': 0.8},
+    'high': {'frequency': 0.8, 'duration': 1.2}
+}
+
+# Hot-path views of the emotion and voice style tables, read by attribute rather than by key
+
+class _EmotionConfig(NamedTuple):
+    prefix: str
+    suffix: str
+    emphasis_words: Tuple[Tuple[str, re.Pattern], ...]  # Word and its compiled case-insensitive pattern
+    gesture_intensity: str
+
+class _VoiceStyle(NamedTuple):
+    pitch: str
+    rate: str
+    volume: str
+    tone: str
+    accent: str
+
+@lru_cache(maxsize=64)
+def _membership_set(values: Tuple[Any, ...]) -> FrozenSet[Any]:
+    """Set view of an avatar capability list; avatars reuse a handful of lists, so lookups are memoized"""
+    return frozenset(values)
+
 class ResponseSynthesizer:
     """Synthesizes responses with voice, emotion, and gesture metadata for avatar"""
     
@@ -121,18 +168,51 @@ class ResponseSynthesizer:
             }
         }
         
-        # Emphasis detection patterns
-        self.emphasis_patterns = [
-            r'\*\*(.*?)\*\*',  # Bold text
-            r'\*(.*?)\*',      # Italic text
-            r'_(.*?)_',        # Underlined text
-            r'`(.*?)`',        # Code/monospace
-            r'"(.*?)"',        # Quoted text
-            r'important',      # Important keyword
-            r'key',           # Key keyword
-            r'remember',      # Remember keyword
-            r'note',          # Note keyword
-        ]
+        # Emphasis detection patterns by kind; each captures the emphasized content in a group
+        # named after its kind
+        self.emphasis_patterns = {
+            'bold': r'\*\*(?P<bold>.*?)\*\*',
+            'italic': r'\*(?P<italic>.*?)\*',
+            'underline': r'_(?P<underline>.*?)_',
+            'code': r'`(?P<code>.*?)`',
+            'quote': r'"(?P<quote>.*?)"',
+            'keyword': r'(?P<keyword>important|key|remember|note)',
+        }
+        
+        # Patterns compiled once. Emphasis is a single alternation scanned once, left to right;
+        # where kinds overlap, the one listed first wins
+        self._emphasis_re = re.compile('|'.join(self.emphasis_patterns.values()), re.IGNORECASE)
+        self._emotion_cfg = {
+            emotion: _EmotionConfig(
+                prefix=config['text_prefix'],
+                suffix=config['text_suffix'],
+                emphasis_words=tuple(
+                    (word, re.compile(re.escape(word), re.IGNORECASE)) for word in config['emphasis_words']
+                ),
+                gesture_intensity=config['gesture_intensity']
+            )
+            for emotion, config in self.emotion_modifiers.items()
+        }
+        self._voice_cfg = {name: _VoiceStyle(**style) for name, style in self.voice_styles.items()}
+        self._build_trigger_index()
+    
+    def _build_trigger_index(self) -> None:
+        """Index gesture triggers for a single scan: trigger -> weighted gestures it counts towards"""
+        trigger_table: Dict[str, List[Tuple[GestureTag, float]]] = {}
+        for gesture, config in self.gesture_mapping.items():
+            weight = _FREQUENCY_WEIGHTS.get(config['frequency'], 1)
+            for trigger in config['triggers']:
+                trigger_table.setdefault(trigger, []).append((gesture, weight))
+        
+        automaton = None
+        if ahocorasick is not None and trigger_table:
+            automaton = ahocorasick.Automaton()
+            for trigger in trigger_table:
+                automaton.add_word(trigger, trigger)
+            automaton.make_automaton()
+        
+        self._trigger_table = trigger_table
+        self._trigger_automaton = automaton
     
     async def synthesize_response(
         self, 
@@ -141,22 +221,22 @@ class ResponseSynthesizer:
         """Synthesize response with voice, emotion, and gesture metadata"""
         try:
             # Process text based on emotion
-            processed_text = await self._process_text_for_emotion(
+            processed_text = self._process_text_for_emotion(
                 input_data.text, 
                 input_data.emotion
             )
             
             # Detect emphasis spans
-            emphasis_spans = await self._detect_emphasis_spans(processed_text)
+            emphasis_spans = self._detect_emphasis_spans(processed_text)
             
             # Determine gesture tag based on content
-            gesture_tag = await self._determine_gesture_tag(
+            gesture_tag = self._determine_gesture_tag(
                 processed_text, 
                 input_data.gesture_tag
             )
             
             # Apply voice style modifications
-            voice_style = await self._apply_voice_style(
+            voice_style = self._apply_voice_style(
                 input_data.voice_style, 
                 input_data.emotion
             )
@@ -183,28 +263,31 @@ class ResponseSynthesizer:
                 emphasis_spans=[]
             )
     
-    async def _process_text_for_emotion(
+    def _process_text_for_emotion(
         self, 
         text: str, 
         emotion: Emotion
     ) -> str:
         """Process text to reflect the intended emotion"""
         try:
-            emotion_config = self.emotion_modifiers.get(emotion, self.emotion_modifiers[Emotion.NEUTRAL])
+            cfg = self._emotion_cfg.get(emotion, self._emotion_cfg[Emotion.NEUTRAL])
+            
+            # Calm and neutral add nothing, leaving only the whitespace cleanup
+            if not cfg.prefix and not cfg.suffix and not cfg.emphasis_words:
+                return ' '.join(text.split())
             
             # Add prefix and suffix
-            processed_text = emotion_config['text_prefix'] + text + emotion_config['text_suffix']
+            processed_text = cfg.prefix + text + cfg.suffix
             
             # Add emphasis to key words
-            emphasis_words = emotion_config['emphasis_words']
-            for word in emphasis_words:
-                if word in processed_text.lower():
-                    # Find and emphasize the word
-                    pattern = re.compile(re.escape(word), re.IGNORECASE)
-                    processed_text = pattern.sub(f'**{word}**', processed_text)
+            for word, pattern in cfg.emphasis_words:
+                # One case-insensitive pass finds and emphasizes the word
+                emphasized_text, count = pattern.subn(f'**{word}**', processed_text)
+                if count:
+                    processed_text = emphasized_text
             
-            # Clean up extra spaces
-            processed_text = re.sub(r'\s+', ' ', processed_text).strip()
+            # Clean up extra spaces; splitting on whitespace also trims the ends
+            processed_text = ' '.join(processed_text.split())
             
             return processed_text
             
@@ -212,27 +295,19 @@ class ResponseSynthesizer:
             logger.error(f"Error processing text for emotion: {e}")
             return text
     
-    async def _detect_emphasis_spans(self, text: str) -> List[Dict[str, int]]:
+    def _detect_emphasis_spans(self, text: str) -> List[Dict[str, int]]:
         """Detect text spans that should be emphasized"""
         try:
             emphasis_spans = []
             
-            for pattern in self.emphasis_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    start = match.start()
-                    end = match.end()
-                    content = match.group(1) if match.groups() else match.group(0)
-                    
-                    emphasis_spans.append({
-                        'start': start,
-                        'end': end,
-                        'content': content,
-                        'type': 'bold' if '**' in pattern else 'italic' if '*' in pattern else 'emphasis'
-                    })
-            
-            # Sort by start position
-            emphasis_spans.sort(key=lambda x: x['start'])
+            for match in self._emphasis_re.finditer(text):
+                kind = match.lastgroup
+                emphasis_spans.append({
+                    'start': match.start(),
+                    'end': match.end(),
+                    'content': match.group(kind),
+                    'type': kind if kind in ('bold', 'italic') else 'emphasis'
+                })
             
             return emphasis_spans
             
@@ -240,7 +315,7 @@ class ResponseSynthesizer:
             logger.error(f"Error detecting emphasis spans: {e}")
             return []
     
-    async def _determine_gesture_tag(
+    def _determine_gesture_tag(
         self, 
         text: str, 
         suggested_gesture: GestureTag
@@ -248,20 +323,18 @@ class ResponseSynthesizer:
         """Determine the most appropriate gesture based on content"""
         try:
             text_lower = text.lower()
-            gesture_scores = {}
-            
-            # Score each gesture based on trigger words
-            for gesture, config in self.gesture_mapping.items():
-                score = 0
-                for trigger in config['triggers']:
-                    if trigger in text_lower:
-                        score += 1
-                
-                # Apply frequency weight
-                frequency_weight = {'high': 2, 'medium': 1.5, 'low': 1}
-                score *= frequency_weight.get(config['frequency'], 1)
-                
-                gesture_scores[gesture] = score
+            
+            # Find the distinct triggers in one pass; overlapping triggers ("no" in "note") all count
+            if self._trigger_automaton is not None:
+                matched = {trigger for _, trigger in self._trigger_automaton.iter(text_lower)}
+            else:
+                matched = {trigger for trigger in self._trigger_table if trigger in text_lower}
+            
+            # Score each gesture by its weighted triggers; ties go to the gesture listed first
+            gesture_scores = dict.fromkeys(self.gesture_mapping, 0.0)
+            for trigger in matched:
+                for gesture, weight in self._trigger_table[trigger]:
+                    gesture_scores[gesture] += weight
             
             # Find best gesture
             if gesture_scores and max(gesture_scores.values()) > 0:
@@ -275,35 +348,26 @@ class ResponseSynthesizer:
             logger.error(f"Error determining gesture tag: {e}")
             return suggested_gesture or GestureTag.AFFIRMATIVE
     
-    async def _apply_voice_style(
+    def _apply_voice_style(
         self, 
         voice_style: str, 
         emotion: Emotion
     ) -> str:
         """Apply voice style modifications based on emotion"""
         try:
-            base_style = self.voice_styles.get(voice_style, self.voice_styles['friendly_male'])
+            base_style = self._voice_cfg.get(voice_style, self._voice_cfg['friendly_male'])
             
             # Modify based on emotion
-            emotion_modifications = {
-                Emotion.ENCOURAGING: {'rate': 'fast', 'volume': 'high'},
-                Emotion.CALM: {'rate': 'slow', 'volume': 'low'},
-                Emotion.EXCITED: {'rate': 'fast', 'volume': 'high'},
-                Emotion.CORRECTIVE: {'rate': 'slow', 'volume': 'medium'},
-                Emotion.NEUTRAL: {}  # No modifications
-            }
-            
-            modifications = emotion_modifications.get(emotion, {})
-            modified_style = {**base_style, **modifications}
+            modified_style = base_style._replace(**_EMOTION_VOICE_MODIFICATIONS.get(emotion, {}))
             
             # Convert back to style string
-            return f"{modified_style['tone']}_{modified_style['pitch']}"
+            return f"{modified_style.tone}_{modified_style.pitch}"
             
         except Exception as e:
             logger.error(f"Error applying voice style: {e}")
             return voice_style
     
-    async def generate_gesture_timeline(
+    def generate_gesture_timeline(
         self, 
         text: str, 
         gesture_tag: GestureTag,
@@ -311,55 +375,42 @@ class ResponseSynthesizer:
     ) -> List[Dict[str, Any]]:
         """Generate timeline of gestures synchronized with text"""
         try:
-            timeline = []
             words = text.split()
             word_duration = 0.5  # seconds per word (estimated)
             
             # Get emotion intensity
-            emotion_config = self.emotion_modifiers.get(emotion, self.emotion_modifiers[Emotion.NEUTRAL])
-            intensity = emotion_config['gesture_intensity']
-            
-            # Map intensity to gesture parameters
-            intensity_params = {
-                'low': {'frequency': 0.3, 'duration': 0.5},
-                'medium': {'frequency': 0.5, 'duration': 0.8},
-                'high': {'frequency': 0.8, 'duration': 1.2}
-            }
-            
-            params = intensity_params.get(intensity, intensity_params['medium'])
+            intensity = self._emotion_cfg.get(emotion, self._emotion_cfg[Emotion.NEUTRAL]).gesture_intensity
+            params = _GESTURE_INTENSITY_PARAMS.get(intensity, _GESTURE_INTENSITY_PARAMS['medium'])
             
-            # Generate gestures at intervals
+            # Gesture on every n-th word, timed by word position
             gesture_interval = int(1 / params['frequency'])  # words between gestures
-            current_time = 0
-            
-            for i, word in enumerate(words):
-                if i % gesture_interval == 0:
-                    gesture = {
-                        'time': current_time,
-                        'duration': params['duration'],
-                        'type': gesture_tag.value,
-                        'intensity': intensity,
-                        'word': word
-                    }
-                    timeline.append(gesture)
-                
-                current_time += word_duration
-            
-            return timeline
+            indices = np.arange(0, len(words), gesture_interval)
+            times = (indices * word_duration).tolist()
+            
+            return [
+                {
+                    'time': current_time,
+                    'duration': params['duration'],
+                    'type': gesture_tag.value,
+                    'intensity': intensity,
+                    'word': words[index]
+                }
+                for index, current_time in zip(indices.tolist(), times)
+            ]
             
         except Exception as e:
             logger.error(f"Error generating gesture timeline: {e}")
             return []
     
-    async def get_voice_style_info(self, voice_style: str) -> Dict[str, Any]:
+    def get_voice_style_info(self, voice_style: str) -> Dict[str, Any]:
         """Get information about a voice style"""
         return self.voice_styles.get(voice_style, self.voice_styles['friendly_male'])
     
-    async def get_emotion_info(self, emotion: Emotion) -> Dict[str, Any]:
+    def get_emotion_info(self, emotion: Emotion) -> Dict[str, Any]:
         """Get information about an emotion configuration"""
         return self.emotion_modifiers.get(emotion, self.emotion_modifiers[Emotion.NEUTRAL])
     
-    async def add_custom_gesture_mapping(
+    def add_custom_gesture_mapping(
         self, 
         gesture: GestureTag, 
         triggers: List[str]
@@ -374,6 +425,7 @@ class ResponseSynthesizer:
                 }
             
             self.gesture_mapping[gesture]['triggers'].extend(triggers)
+            self._build_trigger_index()
             logger.info(f"Added custom gesture mapping for {gesture}: {triggers}")
             return True
             
@@ -390,7 +442,7 @@ class ResponseSynthesizer:
         try:
             # Check if avatar supports specific gestures
             supported_gestures = avatar_capabilities.get('gestures', [])
-            if response.gesture_tag.value not in supported_gestures:
+            if response.gesture_tag.value not in _membership_set(tuple(supported_gestures)):
                 # Fall back to a supported gesture
                 fallback_gesture = supported_gestures[0] if supported_gestures else GestureTag.AFFIRMATIVE
                 response.gesture_tag = fallback_gesture
@@ -401,7 +453,7 @@ class ResponseSynthesizer:
             
             # Adjust for avatar language support
             supported_languages = avatar_capabilities.get('languages', [])
-            if response.language not in supported_languages:
+            if response.language not in _membership_set(tuple(supported_languages)):
                 # Use fallback language
                 response.language = supported_languages[0] if supported_languages else 'en'
             
@@ -1,11 +1,27 @@
+import heapq
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any, Tuple
 import logging
 from models.schemas import SessionCreate, SessionResponse, Language, Persona, MemoryEntry, ContextWindow
 
 logger = logging.getLogger(__name__)
 
+# Entries kept in each session's sliding context window
+_CONTEXT_WINDOW_SIZE = 10
+
+# Rough memory accounting: a fixed cost per session, and per context entry its content plus overhead
+_SESSION_BYTES = 512
+_ENTRY_OVERHEAD_BYTES = 128
+
+def _entry_bytes(entry: MemoryEntry) -> int:
+    return len(entry.content) + _ENTRY_OVERHEAD_BYTES
+
+# Rate limiting window in seconds: a session's bucket refills max_requests tokens per window
+_RATE_LIMIT_WINDOW_S = 60.0
+
 class SessionManager:
     """Manages user sessions, context, and short-term memory"""
     
@@ -13,6 +29,34 @@ class SessionManager:
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self.context_windows: Dict[str, ContextWindow] = {}
         self.rate_limits: Dict[str, Dict[str, Any]] = {}
+        self._context_listeners: List[Callable[[str], Any]] = []
+        
+        # Monotonic last-activity time per session, and a min-heap of (time, session id) for
+        # expiry sweeps. Each activity pushes a new heap entry; entries whose time no longer
+        # matches the session's are stale and skipped when popped
+        self._last_active: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
+        # Approximate bytes held by sessions, kept up to date as they change
+        self._approx_bytes = 0
+    
+    def on_context_change(self, listener: Callable[[str], Any]) -> None:
+        """Register a callback invoked with the session id whenever its context changes"""
+        self._context_listeners.append(listener)
+    
+    def _notify_context_change(self, session_id: str) -> None:
+        for listener in self._context_listeners:
+            listener(session_id)
+    
+    def _touch(self, session_id: str) -> None:
+        now = time.monotonic()
+        self._last_active[session_id] = now
+        heapq.heappush(self._expiry_heap, (now, session_id))
+        
+        # Rebuild once stale entries outnumber live ones, so busy sessions don't grow the heap unbounded
+        if len(self._expiry_heap) > 2 * len(self._last_active) + 64:
+            self._expiry_heap = [(active, sid) for sid, active in self._last_active.items()]
+            heapq.heapify(self._expiry_heap)
         
     async def create_session(
         self, 
@@ -32,25 +76,27 @@ class SessionManager:
                 "persona": persona,
                 "created_at": datetime.now(),
                 "last_activity": datetime.now(),
-                "context_window": [],
+                "context_window": deque(maxlen=_CONTEXT_WINDOW_SIZE),
                 "rate_limit_count": 0,
                 "rate_limit_reset": datetime.now() + timedelta(minutes=1)
             }
             
             # Store session
             self.sessions[session_id] = session_data
+            self._touch(session_id)
+            self._approx_bytes += _SESSION_BYTES
             
             # Initialize context window
             self.context_windows[session_id] = ContextWindow(
                 session_id=session_id,
-                entries=[],
-                max_size=10
+                entries=deque(maxlen=_CONTEXT_WINDOW_SIZE),
+                max_size=_CONTEXT_WINDOW_SIZE
             )
             
             # Initialize rate limiting
             self.rate_limits[session_id] = {
-                "requests": 0,
-                "reset_time": datetime.now() + timedelta(minutes=1),
+                "tokens": 60.0,
+                "last_refill": time.monotonic(),
                 "max_requests": 60  # 60 requests per minute
             }
             
@@ -93,6 +139,7 @@ class SessionManager:
         try:
             if session_id in self.sessions:
                 self.sessions[session_id]["last_activity"] = datetime.now()
+                self._touch(session_id)
                 return True
             return False
         except Exception as e:
@@ -121,24 +168,22 @@ class SessionManager:
                 metadata=metadata or {}
             )
             
-            # Add to context window
+            # Add to context window; the bounded deque drops the oldest entry once full
+            if len(context_window.entries) == context_window.entries.maxlen:
+                self._approx_bytes -= _entry_bytes(context_window.entries[0])
             context_window.entries.append(entry)
+            self._approx_bytes += _entry_bytes(entry)
             
-            # Maintain sliding window size
-            if len(context_window.entries) > context_window.max_size:
-                context_window.entries = context_window.entries[-context_window.max_size:]
+            self._notify_context_change(session_id)
             
-            # Update session context
+            # Mirror the new entry into the session context, bounded the same way
             if session_id in self.sessions:
-                self.sessions[session_id]["context_window"] = [
-                    {
-                        "timestamp": entry.timestamp.isoformat(),
-                        "type": entry.type,
-                        "content": entry.content,
-                        "metadata": entry.metadata
-                    }
-                    for entry in context_window.entries
-                ]
+                self.sessions[session_id]["context_window"].append({
+                    "timestamp": entry.timestamp.isoformat(),
+                    "type": entry.type,
+                    "content": entry.content,
+                    "metadata": entry.metadata
+                })
             
             logger.debug(f"Added {entry_type} entry to context for session {session_id}")
             return True
@@ -150,19 +195,12 @@ class SessionManager:
     async def get_context(self, session_id: str) -> List[Dict[str, Any]]:
         """Get current context window"""
         try:
-            if session_id not in self.context_windows:
+            session_data = self.sessions.get(session_id)
+            if not session_data:
                 return []
-                
-            context_window = self.context_windows[session_id]
-            return [
-                {
-                    "timestamp": entry.timestamp.isoformat(),
-                    "type": entry.type,
-                    "content": entry.content,
-                    "metadata": entry.metadata
-                }
-                for entry in context_window.entries
-            ]
+            
+            # Entries are serialized once, when added to the context
+            return list(session_data["context_window"])
         except Exception as e:
             logger.error(f"Error getting context: {e}")
             return []
@@ -174,19 +212,21 @@ class SessionManager:
                 return True
                 
             rate_limit = self.rate_limits[session_id]
-            now = datetime.now()
+            now = time.monotonic()
             
-            # Reset counter if time window has passed
-            if now >= rate_limit["reset_time"]:
-                rate_limit["requests"] = 0
-                rate_limit["reset_time"] = now + timedelta(minutes=1)
+            # Token bucket: refill for the time elapsed, up to a full window's worth of requests.
+            # Nothing here awaits, so the update is atomic on the event loop
+            max_requests = rate_limit["max_requests"]
+            elapsed = now - rate_limit["last_refill"]
+            rate_limit["tokens"] = min(max_requests, rate_limit["tokens"] + elapsed * max_requests / _RATE_LIMIT_WINDOW_S)
+            rate_limit["last_refill"] = now
             
             # Check if within limits
-            if rate_limit["requests"] >= rate_limit["max_requests"]:
+            if rate_limit["tokens"] < 1.0:
                 return False
-                
-            # Increment counter
-            rate_limit["requests"] += 1
+            
+            # Spend a token
+            rate_limit["tokens"] -= 1.0
             return True
             
         except Exception as e:
@@ -215,18 +255,25 @@ class SessionManager:
     async def cleanup_old_sessions(self, max_age_hours: int = 24) -> int:
         """Clean up old sessions"""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+            cutoff_time = time.monotonic() - max_age_hours * 3600
             sessions_to_remove = []
             
-            for session_id, session_data in self.sessions.items():
-                if session_data["last_activity"] < cutoff_time:
+            # Pop only the expired prefix of the heap, skipping entries superseded by later activity
+            while self._expiry_heap and self._expiry_heap[0][0] < cutoff_time:
+                active, session_id = heapq.heappop(self._expiry_heap)
+                if self._last_active.get(session_id) == active:
                     sessions_to_remove.append(session_id)
             
             # Remove old sessions
             for session_id in sessions_to_remove:
                 self.sessions.pop(session_id, None)
-                self.context_windows.pop(session_id, None)
+                context_window = self.context_windows.pop(session_id, None)
+                self._approx_bytes -= _SESSION_BYTES
+                if context_window is not None:
+                    self._approx_bytes -= sum(_entry_bytes(entry) for entry in context_window.entries)
                 self.rate_limits.pop(session_id, None)
+                self._last_active.pop(session_id, None)
+                self._notify_context_change(session_id)
             
             logger.info(f"Cleaned up {len(sessions_to_remove)} old sessions")
             return len(sessions_to_remove)
@@ -246,7 +293,7 @@ class SessionManager:
             return {
                 "active_sessions": active_sessions,
                 "total_context_entries": total_context_entries,
-                "memory_usage_mb": len(str(self.sessions)) / (1024 * 1024)
+                "memory_usage_mb": self._approx_bytes / (1024 * 1024)
             }
         except Exception as e:
             logger.error(f"Error getting session stats: {e}")
@@ -62,14 +62,8 @@ class STTAgent:
             target_language = language_hint or language
             config = self.language_configs.get(target_language, self.language_configs[Language.ENGLISH])
             
-            # Convert audio data to AudioSegment
-            audio_segment = self._bytes_to_audio_segment(audio_data)
-            
-            # Preprocess audio
-            processed_audio = self._preprocess_audio(audio_segment)
-            
-            # Convert to format expected by speech_recognition
-            wav_data = self._audio_segment_to_wav_bytes(processed_audio)
+            # Decode, clean up and re-encode off the event loop; pydub is CPU-bound and may shell out
+            processed_audio, wav_data = await asyncio.to_thread(self._prepare_audio, audio_data)
             
             # Create AudioData object
             audio_data_obj = sr.AudioData(
@@ -80,7 +74,9 @@ class STTAgent:
             
             # Perform speech recognition
             try:
-                transcript = self.recognizer.recognize_google(
+                # The recognizer makes a blocking HTTP call, so it runs in a worker thread
+                transcript = await asyncio.to_thread(
+                    self.recognizer.recognize_google,
                     audio_data_obj,
                     language=config["google_lang"],
                     show_all=True
@@ -174,6 +170,11 @@ class STTAgent:
             logger.error(f"Error detecting voice activity: {e}")
             return False
     
+    def _prepare_audio(self, audio_data: bytes) -> Tuple[AudioSegment, bytes]:
+        """Decode and preprocess raw audio; returns the segment and the WAV bytes for recognition"""
+        processed_audio = self._preprocess_audio(self._bytes_to_audio_segment(audio_data))
+        return processed_audio, self._audio_segment_to_wav_bytes(processed_audio)
+    
     def _bytes_to_audio_segment(self, audio_data: bytes) -> AudioSegment:
         """Convert raw bytes to AudioSegment"""
         try:
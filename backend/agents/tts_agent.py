@@ -1,8 +1,10 @@
 import io
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+import httpx
 import numpy as np
+import openai
 from pydub import AudioSegment
 from pydub.generators import Sine
 import requests
@@ -11,11 +13,37 @@ from models.schemas import Language, Emotion, TTSOutput
 
 logger = logging.getLogger(__name__)
 
+# Streamed speech is raw 16-bit mono PCM at the OpenAI "pcm" format's rate
+STREAM_SAMPLE_RATE = 24000
+_STREAM_BYTES_PER_MS = STREAM_SAMPLE_RATE * 2 // 1000
+# Frame sizes for streamed audio: small first frames for a fast start, then larger ones
+_PROGRESSIVE_FRAME_MS = (20, 40, 80, 160, 200)
+
+async def _progressive_frames(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Re-slice a PCM byte stream into frames of growing duration, flushing the tail at the end"""
+    buffer = bytearray()
+    step = 0
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        frame_size = _PROGRESSIVE_FRAME_MS[step] * _STREAM_BYTES_PER_MS
+        while len(buffer) >= frame_size:
+            yield bytes(buffer[:frame_size])
+            del buffer[:frame_size]
+            step = min(step + 1, len(_PROGRESSIVE_FRAME_MS) - 1)
+            frame_size = _PROGRESSIVE_FRAME_MS[step] * _STREAM_BYTES_PER_MS
+    if buffer:
+        yield bytes(buffer)
+
 class TTSAgent:
     """Text-to-Speech agent with multiple voice options and emotion support"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, http_client: Optional[httpx.AsyncClient] = None):
         self.openai_api_key = openai_api_key
+        # One client for the agent's lifetime, so TTS calls reuse pooled connections
+        self.http_client = http_client or httpx.AsyncClient(timeout=30.0)
+        self.openai_client = (
+            openai.AsyncOpenAI(api_key=openai_api_key, http_client=self.http_client) if openai_api_key else None
+        )
         
         # Voice configurations for different languages and emotions
         self.voice_configs = {
@@ -97,6 +125,15 @@ class TTSAgent:
             }
         }
     
+    async def warmup(self) -> None:
+        """Open a pooled connection to the TTS API ahead of the first request"""
+        if self.openai_client is None:
+            return
+        try:
+            await self.openai_client.models.list()
+        except Exception as e:
+            logger.warning(f"TTS warmup failed: {e}")
+    
     async def synthesize_speech(
         self,
         text: str,
@@ -115,10 +152,10 @@ class TTSAgent:
                 audio_data = await self._generate_with_openai(text, voice_name)
             else:
                 # Fallback to basic synthesis
-                audio_data = await self._generate_basic_speech(text, voice_style, emotion)
+                audio_data = await asyncio.to_thread(self._generate_basic_speech, text, voice_style, emotion)
             
-            # Apply emotion modifications
-            modified_audio = await self._apply_emotion_modifications(audio_data, emotion)
+            # Apply emotion modifications; pydub processing is CPU-bound, so it runs off the event loop
+            modified_audio = await asyncio.to_thread(self._apply_emotion_modifications, audio_data, emotion)
             
             # Generate phoneme timestamps
             phoneme_timestamps = await self._generate_phoneme_timestamps(text, modified_audio)
@@ -127,7 +164,8 @@ class TTSAgent:
             
             return TTSOutput(
                 audio_data=modified_audio,
-                phoneme_timestamps=phoneme_timestamps
+                phoneme_timestamps=phoneme_timestamps,
+                total_duration=phoneme_timestamps[-1]['end'] if phoneme_timestamps else 0.0
             )
             
         except Exception as e:
@@ -137,14 +175,49 @@ class TTSAgent:
                 phoneme_timestamps=[]
             )
     
+    async def stream_speech(
+        self,
+        text: str,
+        voice_style: str = "friendly_male",
+        language: Language = Language.ENGLISH
+    ) -> AsyncIterator[bytes]:
+        """Stream speech as raw PCM frames (see STREAM_SAMPLE_RATE) while it is being synthesized"""
+        voice_config = self.voice_configs.get(language, self.voice_configs[Language.ENGLISH])
+        voice_name = voice_config['voices'].get(voice_style, voice_config['default_voice'])
+        
+        if self.openai_client is not None:
+            chunks = self._stream_with_openai(text, voice_name)
+        else:
+            chunks = self._stream_basic_speech(text, voice_style)
+        
+        async for frame in _progressive_frames(chunks):
+            yield frame
+    
+    async def _stream_with_openai(self, text: str, voice_name: str) -> AsyncIterator[bytes]:
+        """Stream PCM from the OpenAI speech endpoint as the response body arrives"""
+        async with self.openai_client.audio.speech.with_streaming_response.create(
+            model="tts-1",
+            voice=voice_name,
+            input=text,
+            response_format="pcm"
+        ) as response:
+            async for chunk in response.iter_bytes():
+                yield chunk
+    
+    async def _stream_basic_speech(self, text: str, voice_style: str) -> AsyncIterator[bytes]:
+        """Fallback stream: synthesize the basic speech whole and convert it to the stream format"""
+        wav_data = await asyncio.to_thread(self._generate_basic_speech, text, voice_style, Emotion.NEUTRAL)
+        if wav_data:
+            yield await asyncio.to_thread(self._wav_to_stream_pcm, wav_data)
+    
+    def _wav_to_stream_pcm(self, wav_data: bytes) -> bytes:
+        audio = AudioSegment.from_wav(io.BytesIO(wav_data))
+        return audio.set_frame_rate(STREAM_SAMPLE_RATE).set_channels(1).set_sample_width(2).raw_data
+    
     async def _generate_with_openai(self, text: str, voice_name: str) -> bytes:
         """Generate speech using OpenAI TTS API"""
         try:
-            import openai
-            
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            
-            response = client.audio.speech.create(
+            response = await self.openai_client.audio.speech.create(
                 model="tts-1",
                 voice=voice_name,
                 input=text
@@ -156,7 +229,7 @@ class TTSAgent:
             logger.error(f"Error with OpenAI TTS: {e}")
             raise
     
-    async def _generate_basic_speech(
+    def _generate_basic_speech(
         self, 
         text: str, 
         voice_style: str, 
@@ -198,7 +271,7 @@ class TTSAgent:
             logger.error(f"Error generating basic speech: {e}")
             return b''
     
-    async def _apply_emotion_modifications(
+    def _apply_emotion_modifications(
         self, 
         audio_data: bytes, 
         emotion: Emotion
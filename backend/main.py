@@ -1,11 +1,13 @@
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
 import asyncio
-import json
-from typing import Dict, List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 import logging
+import orjson
+from pydantic import BaseModel
 
 from agents.session_manager import SessionManager
 from agents.orchestrator import AgentOrchestrator
@@ -14,7 +16,8 @@ from models.schemas import (
     AudioRequest, AudioResponse,
     TextRequest, TextResponse,
     QuizRequest, QuizResponse,
-    HomeworkRequest, HomeworkResponse
+    HomeworkRequest, HomeworkResponse,
+    AvatarCoordinatorOutput
 )
 from database.connection import get_db
 from utils.config import settings
@@ -23,6 +26,19 @@ from utils.config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the types orjson does not handle natively: models and str-valued enums"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _dumps(obj: Any) -> str:
+    return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS).decode()
+
 # Global instances
 session_manager = None
 orchestrator = None
@@ -37,18 +53,21 @@ async def lifespan(app: FastAPI):
     
     # Initialize orchestrator
     orchestrator = AgentOrchestrator()
+    await orchestrator.warmup()
     
     logger.info("AI Tutor application started")
     yield
     
     # Cleanup on shutdown
+    await orchestrator.aclose()
     logger.info("AI Tutor application shutting down")
 
 app = FastAPI(
     title="AI Tutor API",
     description="Multi-agent AI tutoring system with voice and avatar support",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -155,6 +174,18 @@ async def process_text(
         logger.error(f"Error processing text: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Avatar Rendering
+@app.get("/api/avatar/{avatar_id}", response_model=AvatarCoordinatorOutput)
+async def get_avatar(
+    avatar_id: str,
+    orchestrator: AgentOrchestrator = Depends(get_orchestrator)
+):
+    """Wait for a detached avatar render to finish and return it"""
+    avatar_output = await orchestrator.get_avatar(avatar_id)
+    if avatar_output is None:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    return avatar_output
+
 # Quiz Generation
 @app.post("/api/quiz/generate", response_model=QuizResponse)
 async def generate_quiz(
@@ -208,7 +239,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         while True:
             # Receive message from client
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # Process through orchestrator
             if message["type"] == "audio":
@@ -225,7 +256,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                 )
             
             # Send response back to client
-            await websocket.send_text(json.dumps(result))
+            await websocket.send_text(_dumps(result))
             
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for session {session_id}")
@@ -257,7 +288,7 @@ async def stream_audio(
                 )
                 
                 if result:
-                    yield f"data: {json.dumps(result)}\n\n"
+                    yield f"data: {_dumps(result)}\n\n"
         
         return StreamingResponse(
             generate_audio_response(),
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Deque
 from enum import Enum
 from datetime import datetime
 
@@ -91,6 +91,12 @@ class TextResponse(BaseModel):
     emotion: Emotion = Emotion.NEUTRAL
     gesture_tag: GestureTag = GestureTag.AFFIRMATIVE
     emphasis_spans: List[Dict[str, int]] = []
+    
+    @classmethod
+    def from_final(cls, final: Dict[str, Any]) -> "TextResponse":
+        """Build from a pipeline final_response dict; missing fields take their defaults"""
+        fields = {name: final[name] for name in cls.model_fields if name in final}
+        return cls(**{"text": "", "confidence": 0.0, **fields})
 
 # Quiz System
 class QuizRequest(BaseModel):
@@ -177,12 +183,14 @@ class TTSOutput(BaseModel):
     audio_url: Optional[str] = None
     audio_data: Optional[bytes] = None
     phoneme_timestamps: List[Dict[str, Union[str, float]]] = []
+    total_duration: float = 0.0  # End of the last phoneme, in seconds
 
 class AvatarCoordinatorOutput(BaseModel):
     video_url: Optional[str] = None
     webrtc_token: Optional[str] = None
     expected_delay_ms: int = 1500
     gesture_timeline: List[Dict[str, Any]] = []
+    status: str = "ready"  # "pending" while a detached render is still running
 
 # Memory and Context
 class MemoryEntry(BaseModel):
@@ -193,7 +201,7 @@ class MemoryEntry(BaseModel):
 
 class ContextWindow(BaseModel):
     session_id: str
-    entries: List[MemoryEntry]
+    entries: Deque[MemoryEntry]  # Bounded to max_size via the deque's maxlen
     max_size: int = 10
 
 # Error Handling
@@ -0,0 +1,85 @@
+import logging
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Optional; without an embedder the cache never hits
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+# Unit vectors are stored as int8 scaled by this factor, a quarter of the float32 footprint
+_QUANT_SCALE = 127
+
+class _Bucket:
+    """Fixed-capacity ring of quantized embeddings and their cached values"""
+    
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.int8)
+        self.values: List[Any] = []
+        self.next_slot = 0
+    
+    def add(self, vector: np.ndarray, value: Any) -> None:
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        if slot < len(self.values):
+            self.values[slot] = value
+        else:
+            self.values.append(value)
+        self.next_slot = (slot + 1) % len(self.vectors)
+
+class SemanticCache:
+    """Reuse responses for questions that mean the same thing as an earlier one.
+    
+    Questions are embedded with a sentence-transformers model and kept as int8-quantized unit
+    vectors in one bucket per key (e.g. subject and language). A lookup is a brute-force inner
+    product over the bucket, well under a millisecond at this size, and hits at or above
+    ``threshold`` cosine similarity. Each bucket holds ``max_entries``, replacing the oldest.
+    """
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.93, max_entries: int = 4096):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embedder = None
+        self._buckets: Dict[Hashable, _Bucket] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return SentenceTransformer is not None
+    
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed and quantize a question; blocking, so run it off the event loop"""
+        if not self.enabled:
+            return None
+        
+        if self._embedder is None:
+            self._embedder = SentenceTransformer(self.model_name)
+            logger.info(f"Loaded semantic cache embedder {self.model_name}")
+        
+        vector = self._embedder.encode(text, normalize_embeddings=True)
+        return np.round(vector * _QUANT_SCALE).astype(np.int8)
+    
+    def lookup(self, embedding: np.ndarray, key: Hashable) -> Optional[Any]:
+        """Return the value cached for the most similar question under ``key``, if similar enough"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None
+        
+        stored = bucket.vectors[:len(bucket.values)].astype(np.int32)
+        similarities = stored @ embedding.astype(np.int32) / (_QUANT_SCALE * _QUANT_SCALE)
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        return bucket.values[best]
+    
+    def add(self, embedding: np.ndarray, key: Hashable, value: Any) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.max_entries, len(embedding))
+        bucket.add(embedding, value)
+    
+    def clear(self) -> None:
+        self._buckets.clear()